@@ -17,12 +17,14 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column("users", sa.Column("auth_apple", sa.Boolean(), nullable=False, server_default=sa.text("false")))
-    op.add_column("users", sa.Column("auth_google", sa.Boolean(), nullable=False, server_default=sa.text("false")))
-    op.add_column("users", sa.Column("auth_microsoft", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("auth_apple", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+        batch_op.add_column(sa.Column("auth_google", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+        batch_op.add_column(sa.Column("auth_microsoft", sa.Boolean(), nullable=False, server_default=sa.text("false")))
 
 
 def downgrade() -> None:
-    op.drop_column("users", "auth_microsoft")
-    op.drop_column("users", "auth_google")
-    op.drop_column("users", "auth_apple")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("auth_microsoft")
+        batch_op.drop_column("auth_google")
+        batch_op.drop_column("auth_apple")
@@ -19,20 +19,22 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "users",
-        sa.Column("supabase_user_id", postgresql.UUID(as_uuid=True), nullable=True),
-    )
+    # Batch the column changes so SQLite rebuilds the table once.
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("supabase_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        )
+        batch_op.alter_column("hashed_password", existing_type=sa.String(length=255), nullable=True)
     op.create_index(
         "ix_users_supabase_user_id",
         "users",
         ["supabase_user_id"],
         unique=True,
     )
-    op.alter_column("users", "hashed_password", existing_type=sa.String(length=255), nullable=True)
 
 
 def downgrade() -> None:
-    op.alter_column("users", "hashed_password", existing_type=sa.String(length=255), nullable=False)
     op.drop_index("ix_users_supabase_user_id", table_name="users")
-    op.drop_column("users", "supabase_user_id")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("hashed_password", existing_type=sa.String(length=255), nullable=False)
+        batch_op.drop_column("supabase_user_id")
@@ -0,0 +1,55 @@
+"""Store action enums as VARCHAR with CHECK constraints instead of native PG enums.
+
+Revision ID: 20261016_action_enums_varchar
+Revises: 20261016_timestamp_defaults
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_action_enums_varchar"
+down_revision: Union[str, None] = "20261016_timestamp_defaults"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# column -> (enum type / constraint name, member names as stored by SQLAlchemy)
+ENUM_COLUMNS = {
+    "action_type": ("actiontype", ("CALENDAR", "EMAIL", "REMINDER", "NEXT_STEP")),
+    "status": ("actionstatus", ("PENDING", "CREATED", "EXECUTED", "FAILED", "CANCELLED")),
+    "priority": ("actionpriority", ("LOW", "MEDIUM", "HIGH")),
+}
+
+
+def _in_list(values) -> str:
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def upgrade() -> None:
+    for column, (name, values) in ENUM_COLUMNS.items():
+        op.alter_column(
+            "actions",
+            column,
+            type_=sa.String(length=20),
+            existing_type=postgresql.ENUM(*values, name=name),
+            postgresql_using=f"{column}::text",
+        )
+        op.execute(f"DROP TYPE IF EXISTS {name}")
+        op.create_check_constraint(name, "actions", f"{column} IN ({_in_list(values)})")
+
+
+def downgrade() -> None:
+    for column, (name, values) in ENUM_COLUMNS.items():
+        op.drop_constraint(name, "actions", type_="check")
+        enum_type = postgresql.ENUM(*values, name=name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            "actions",
+            column,
+            type_=enum_type,
+            existing_type=sa.String(length=20),
+            postgresql_using=f"{column}::{name}",
+        )
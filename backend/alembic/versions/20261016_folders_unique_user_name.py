@@ -0,0 +1,50 @@
+"""Enforce unique folder names per user.
+
+Revision ID: 20261016_folders_user_name_uq
+Revises: 20261016_notes_user_feed_idx
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_folders_user_name_uq"
+down_revision: Union[str, None] = "20261016_notes_user_feed_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The API already rejects duplicate names, but the AI find-or-create paths
+    # could race. Rename any stragglers (keeping the oldest) rather than merge
+    # them, so no notes or subfolders move.
+    op.execute(
+        """
+        UPDATE folders SET name = left(folders.name, 244) || ' (' || left(folders.id::text, 8) || ')'
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id, name ORDER BY created_at, id) AS rn
+            FROM folders
+        ) ranked
+        WHERE folders.id = ranked.id AND ranked.rn > 1
+        """
+    )
+
+    # CONCURRENTLY can't run inside a transaction; build without locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_folders_user_name",
+            "folders",
+            ["user_id", "name"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_folders_user_name",
+            table_name="folders",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,44 @@
+"""Add trigram indexes for note title/transcript search.
+
+Revision ID: 20261016_notes_search_trgm
+Revises: 20261016_notes_user_folder_idx
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_notes_search_trgm"
+down_revision: Union[str, None] = "20261016_notes_user_folder_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("title", "transcript")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY can't run inside a transaction; build without locking writes
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f"idx_notes_{column}_trgm",
+                "notes",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(
+                f"idx_notes_{column}_trgm",
+                table_name="notes",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,38 @@
+"""Add a partial index matching the note list order.
+
+Revision ID: 20261016_notes_user_feed_idx
+Revises: 20261016_notes_search_trgm
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_notes_user_feed_idx"
+down_revision: Union[str, None] = "20261016_notes_search_trgm"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; build without locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_notes_user_feed",
+            "notes",
+            ["user_id", "is_archived", sa.text("is_pinned DESC"), sa.text("created_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_notes_user_feed",
+            table_name="notes",
+            postgresql_concurrently=True,
+        )
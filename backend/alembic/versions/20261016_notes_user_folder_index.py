@@ -0,0 +1,39 @@
+"""Add a partial covering index for per-folder note counts.
+
+Revision ID: 20261016_notes_user_folder_idx
+Revises: 20261016_action_enums_varchar
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_notes_user_folder_idx"
+down_revision: Union[str, None] = "20261016_action_enums_varchar"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; build without locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_notes_user_folder_active",
+            "notes",
+            ["user_id", "folder_id"],
+            unique=False,
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_include=["id", "is_archived"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_notes_user_folder_active",
+            table_name="notes",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,30 @@
+"""Compute created_at/updated_at defaults in the database.
+
+Revision ID: 20261016_timestamp_defaults
+Revises: 20260206_auth_provider_flags
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_timestamp_defaults"
+down_revision: Union[str, None] = "20260206_auth_provider_flags"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "folders", "notes", "actions")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for column in ("created_at", "updated_at"):
+            op.alter_column(table, column, existing_type=sa.DateTime(), server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in ("created_at", "updated_at"):
+            op.alter_column(table, column, existing_type=sa.DateTime(), server_default=None)
@@ -1,7 +1,7 @@
 """Application configuration using Pydantic Settings."""
-from functools import lru_cache
+from functools import cache, cached_property
 from pathlib import Path
-from typing import List
+from typing import FrozenSet
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -33,6 +33,12 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = ""
+    db_pool_size: int = 10  # Per worker process; keep workers * (size + overflow) under the PG limit
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 10  # Seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is recycled
+    db_statement_cache_size: int = 1024  # asyncpg prepared statements per connection (0 for pgbouncer)
+    db_prepared_statement_cache_size: int = 500  # SQLAlchemy's asyncpg statement LRU (0 for pgbouncer)
 
     @property
     def database_url_async(self) -> str:
@@ -83,13 +89,17 @@ class Settings(BaseSettings):
     debug: bool = True
     allowed_origins: str = "http://localhost:3000,exp://localhost:8081"
 
-    @property
-    def cors_origins(self) -> List[str]:
-        """Parse CORS origins from comma-separated string."""
-        return [origin.strip() for origin in self.allowed_origins.split(",")]
+    @cached_property
+    def cors_origins(self) -> FrozenSet[str]:
+        """
+        Parse CORS origins from comma-separated string (once per instance).
+
+        A frozenset so CORSMiddleware's per-request origin check is a hash lookup.
+        """
+        return frozenset(origin.strip() for origin in self.allowed_origins.split(","))
 
 
-@lru_cache
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -9,7 +9,8 @@ Following industry standards from Google, Microsoft, and Stripe APIs:
 """
 
 from enum import Enum
-from typing import Optional, Any, Dict, List
+from types import MappingProxyType
+from typing import Optional, Any, Dict, List, Mapping
 from fastapi import HTTPException, status
 
 
@@ -26,123 +27,80 @@ class ErrorCode(str, Enum):
     - RATE_*: Rate limiting errors (429)
     - EXTERNAL_*: External service errors (502/503)
     - INTERNAL_*: Internal server errors (500)
+
+    Each member carries its HTTP status as ``http_status``; ``value`` is the
+    wire code string.
     """
 
+    http_status: int
+
+    def __new__(cls, value: str, http_status: int) -> "ErrorCode":
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.http_status = http_status
+        return member
+
     # Validation Errors (400)
-    VALIDATION_FAILED = "validation_failed"
-    VALIDATION_INVALID_FORMAT = "invalid_format"
-    VALIDATION_MISSING_FIELD = "missing_required_field"
-    VALIDATION_INVALID_VALUE = "invalid_value"
-    VALIDATION_INVALID_AUDIO_FORMAT = "invalid_audio_format"
-    VALIDATION_INVALID_FILE_SIZE = "invalid_file_size"
-    VALIDATION_INVALID_CREDENTIALS = "invalid_credentials"
-    VALIDATION_WEAK_PASSWORD = "weak_password"
-    VALIDATION_INVALID_TOKEN = "invalid_token"
+    VALIDATION_FAILED = ("validation_failed", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_FORMAT = ("invalid_format", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_MISSING_FIELD = ("missing_required_field", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_VALUE = ("invalid_value", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_AUDIO_FORMAT = ("invalid_audio_format", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_FILE_SIZE = ("invalid_file_size", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_CREDENTIALS = ("invalid_credentials", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_WEAK_PASSWORD = ("weak_password", status.HTTP_400_BAD_REQUEST)
+    VALIDATION_INVALID_TOKEN = ("invalid_token", status.HTTP_400_BAD_REQUEST)
 
     # Authentication Errors (401)
-    AUTH_REQUIRED = "authentication_required"
-    AUTH_INVALID_TOKEN = "invalid_auth_token"
-    AUTH_EXPIRED_TOKEN = "expired_auth_token"
-    AUTH_INVALID_REFRESH_TOKEN = "invalid_refresh_token"
-    AUTH_INVALID_APPLE_TOKEN = "invalid_apple_token"
+    AUTH_REQUIRED = ("authentication_required", status.HTTP_401_UNAUTHORIZED)
+    AUTH_INVALID_TOKEN = ("invalid_auth_token", status.HTTP_401_UNAUTHORIZED)
+    AUTH_EXPIRED_TOKEN = ("expired_auth_token", status.HTTP_401_UNAUTHORIZED)
+    AUTH_INVALID_REFRESH_TOKEN = ("invalid_refresh_token", status.HTTP_401_UNAUTHORIZED)
+    AUTH_INVALID_APPLE_TOKEN = ("invalid_apple_token", status.HTTP_401_UNAUTHORIZED)
 
     # Authorization Errors (403)
-    PERMISSION_DENIED = "permission_denied"
-    PERMISSION_RESOURCE_ACCESS = "resource_access_denied"
-    PERMISSION_INSUFFICIENT_SCOPE = "insufficient_scope"
-    PERMISSION_ACCOUNT_INACTIVE = "account_inactive"
+    PERMISSION_DENIED = ("permission_denied", status.HTTP_403_FORBIDDEN)
+    PERMISSION_RESOURCE_ACCESS = ("resource_access_denied", status.HTTP_403_FORBIDDEN)
+    PERMISSION_INSUFFICIENT_SCOPE = ("insufficient_scope", status.HTTP_403_FORBIDDEN)
+    PERMISSION_ACCOUNT_INACTIVE = ("account_inactive", status.HTTP_403_FORBIDDEN)
 
     # Not Found Errors (404)
-    NOT_FOUND_RESOURCE = "resource_not_found"
-    NOT_FOUND_USER = "user_not_found"
-    NOT_FOUND_NOTE = "note_not_found"
-    NOT_FOUND_FOLDER = "folder_not_found"
-    NOT_FOUND_ACTION = "action_not_found"
-    NOT_FOUND_INTEGRATION = "integration_not_found"
+    NOT_FOUND_RESOURCE = ("resource_not_found", status.HTTP_404_NOT_FOUND)
+    NOT_FOUND_USER = ("user_not_found", status.HTTP_404_NOT_FOUND)
+    NOT_FOUND_NOTE = ("note_not_found", status.HTTP_404_NOT_FOUND)
+    NOT_FOUND_FOLDER = ("folder_not_found", status.HTTP_404_NOT_FOUND)
+    NOT_FOUND_ACTION = ("action_not_found", status.HTTP_404_NOT_FOUND)
+    NOT_FOUND_INTEGRATION = ("integration_not_found", status.HTTP_404_NOT_FOUND)
 
     # Conflict Errors (409)
-    CONFLICT_RESOURCE_EXISTS = "resource_already_exists"
-    CONFLICT_EMAIL_EXISTS = "email_already_registered"
-    CONFLICT_FOLDER_EXISTS = "folder_already_exists"
-    CONFLICT_ACTION_EXECUTED = "action_already_executed"
+    CONFLICT_RESOURCE_EXISTS = ("resource_already_exists", status.HTTP_409_CONFLICT)
+    CONFLICT_EMAIL_EXISTS = ("email_already_registered", status.HTTP_409_CONFLICT)
+    CONFLICT_FOLDER_EXISTS = ("folder_already_exists", status.HTTP_409_CONFLICT)
+    CONFLICT_ACTION_EXECUTED = ("action_already_executed", status.HTTP_409_CONFLICT)
 
     # Rate Limiting Errors (429)
-    RATE_LIMIT_EXCEEDED = "rate_limit_exceeded"
-    RATE_LIMIT_API = "api_rate_limit_exceeded"
-    RATE_LIMIT_UPLOAD = "upload_rate_limit_exceeded"
+    RATE_LIMIT_EXCEEDED = ("rate_limit_exceeded", status.HTTP_429_TOO_MANY_REQUESTS)
+    RATE_LIMIT_API = ("api_rate_limit_exceeded", status.HTTP_429_TOO_MANY_REQUESTS)
+    RATE_LIMIT_UPLOAD = ("upload_rate_limit_exceeded", status.HTTP_429_TOO_MANY_REQUESTS)
 
     # External Service Errors (502/503)
-    EXTERNAL_SERVICE_ERROR = "external_service_error"
-    EXTERNAL_TRANSCRIPTION_FAILED = "transcription_service_failed"
-    EXTERNAL_LLM_FAILED = "llm_service_failed"
-    EXTERNAL_STORAGE_FAILED = "storage_service_failed"
-    EXTERNAL_GOOGLE_FAILED = "google_service_failed"
-    EXTERNAL_APPLE_FAILED = "apple_service_failed"
+    EXTERNAL_SERVICE_ERROR = ("external_service_error", status.HTTP_502_BAD_GATEWAY)
+    EXTERNAL_TRANSCRIPTION_FAILED = ("transcription_service_failed", status.HTTP_502_BAD_GATEWAY)
+    EXTERNAL_LLM_FAILED = ("llm_service_failed", status.HTTP_502_BAD_GATEWAY)
+    EXTERNAL_STORAGE_FAILED = ("storage_service_failed", status.HTTP_502_BAD_GATEWAY)
+    EXTERNAL_GOOGLE_FAILED = ("google_service_failed", status.HTTP_502_BAD_GATEWAY)
+    EXTERNAL_APPLE_FAILED = ("apple_service_failed", status.HTTP_502_BAD_GATEWAY)
 
     # Internal Errors (500)
-    INTERNAL_ERROR = "internal_server_error"
-    INTERNAL_DATABASE_ERROR = "database_error"
-    INTERNAL_PROCESSING_ERROR = "processing_error"
-
-
-# HTTP Status Code Mapping
-ERROR_CODE_STATUS_MAP: Dict[ErrorCode, int] = {
-    # Validation (400)
-    ErrorCode.VALIDATION_FAILED: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_FORMAT: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_MISSING_FIELD: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_VALUE: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_FILE_SIZE: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_CREDENTIALS: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_WEAK_PASSWORD: status.HTTP_400_BAD_REQUEST,
-    ErrorCode.VALIDATION_INVALID_TOKEN: status.HTTP_400_BAD_REQUEST,
-
-    # Authentication (401)
-    ErrorCode.AUTH_REQUIRED: status.HTTP_401_UNAUTHORIZED,
-    ErrorCode.AUTH_INVALID_TOKEN: status.HTTP_401_UNAUTHORIZED,
-    ErrorCode.AUTH_EXPIRED_TOKEN: status.HTTP_401_UNAUTHORIZED,
-    ErrorCode.AUTH_INVALID_REFRESH_TOKEN: status.HTTP_401_UNAUTHORIZED,
-    ErrorCode.AUTH_INVALID_APPLE_TOKEN: status.HTTP_401_UNAUTHORIZED,
-
-    # Authorization (403)
-    ErrorCode.PERMISSION_DENIED: status.HTTP_403_FORBIDDEN,
-    ErrorCode.PERMISSION_RESOURCE_ACCESS: status.HTTP_403_FORBIDDEN,
-    ErrorCode.PERMISSION_INSUFFICIENT_SCOPE: status.HTTP_403_FORBIDDEN,
-    ErrorCode.PERMISSION_ACCOUNT_INACTIVE: status.HTTP_403_FORBIDDEN,
-
-    # Not Found (404)
-    ErrorCode.NOT_FOUND_RESOURCE: status.HTTP_404_NOT_FOUND,
-    ErrorCode.NOT_FOUND_USER: status.HTTP_404_NOT_FOUND,
-    ErrorCode.NOT_FOUND_NOTE: status.HTTP_404_NOT_FOUND,
-    ErrorCode.NOT_FOUND_FOLDER: status.HTTP_404_NOT_FOUND,
-    ErrorCode.NOT_FOUND_ACTION: status.HTTP_404_NOT_FOUND,
-    ErrorCode.NOT_FOUND_INTEGRATION: status.HTTP_404_NOT_FOUND,
-
-    # Conflict (409)
-    ErrorCode.CONFLICT_RESOURCE_EXISTS: status.HTTP_409_CONFLICT,
-    ErrorCode.CONFLICT_EMAIL_EXISTS: status.HTTP_409_CONFLICT,
-    ErrorCode.CONFLICT_FOLDER_EXISTS: status.HTTP_409_CONFLICT,
-    ErrorCode.CONFLICT_ACTION_EXECUTED: status.HTTP_409_CONFLICT,
-
-    # Rate Limiting (429)
-    ErrorCode.RATE_LIMIT_EXCEEDED: status.HTTP_429_TOO_MANY_REQUESTS,
-    ErrorCode.RATE_LIMIT_API: status.HTTP_429_TOO_MANY_REQUESTS,
-    ErrorCode.RATE_LIMIT_UPLOAD: status.HTTP_429_TOO_MANY_REQUESTS,
-
-    # External Service (502/503)
-    ErrorCode.EXTERNAL_SERVICE_ERROR: status.HTTP_502_BAD_GATEWAY,
-    ErrorCode.EXTERNAL_TRANSCRIPTION_FAILED: status.HTTP_502_BAD_GATEWAY,
-    ErrorCode.EXTERNAL_LLM_FAILED: status.HTTP_502_BAD_GATEWAY,
-    ErrorCode.EXTERNAL_STORAGE_FAILED: status.HTTP_502_BAD_GATEWAY,
-    ErrorCode.EXTERNAL_GOOGLE_FAILED: status.HTTP_502_BAD_GATEWAY,
-    ErrorCode.EXTERNAL_APPLE_FAILED: status.HTTP_502_BAD_GATEWAY,
-
-    # Internal (500)
-    ErrorCode.INTERNAL_ERROR: status.HTTP_500_INTERNAL_SERVER_ERROR,
-    ErrorCode.INTERNAL_DATABASE_ERROR: status.HTTP_500_INTERNAL_SERVER_ERROR,
-    ErrorCode.INTERNAL_PROCESSING_ERROR: status.HTTP_500_INTERNAL_SERVER_ERROR,
-}
+    INTERNAL_ERROR = ("internal_server_error", status.HTTP_500_INTERNAL_SERVER_ERROR)
+    INTERNAL_DATABASE_ERROR = ("database_error", status.HTTP_500_INTERNAL_SERVER_ERROR)
+    INTERNAL_PROCESSING_ERROR = ("processing_error", status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# HTTP Status Code Mapping (read-only view derived from the enum)
+ERROR_CODE_STATUS_MAP: Mapping[ErrorCode, int] = MappingProxyType(
+    {code: code.http_status for code in ErrorCode}
+)
 
 
 class APIError(Exception):
@@ -163,6 +121,8 @@ class APIError(Exception):
         )
     """
 
+    __slots__ = ("code", "message", "param", "details", "headers", "status_code")
+
     def __init__(
         self,
         code: ErrorCode,
@@ -176,9 +136,7 @@ class APIError(Exception):
         self.param = param
         self.details = details or []
         self.headers = headers or {}
-        self.status_code = ERROR_CODE_STATUS_MAP.get(
-            code, status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        self.status_code = code.http_status
         super().__init__(message)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -199,6 +157,8 @@ class APIError(Exception):
 class ValidationError(APIError):
     """Raised when input validation fails."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str,
@@ -212,6 +172,8 @@ class ValidationError(APIError):
 class NotFoundError(APIError):
     """Raised when a requested resource is not found."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         resource: str,
@@ -239,6 +201,8 @@ class NotFoundError(APIError):
 class ConflictError(APIError):
     """Raised when there's a resource conflict (e.g., duplicate)."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str,
@@ -251,6 +215,8 @@ class ConflictError(APIError):
 class AuthenticationError(APIError):
     """Raised when authentication fails."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str = "Authentication required",
@@ -262,6 +228,8 @@ class AuthenticationError(APIError):
 class AuthorizationError(APIError):
     """Raised when user lacks permission for an action."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str = "Permission denied",
@@ -275,6 +243,8 @@ class AuthorizationError(APIError):
 class RateLimitError(APIError):
     """Raised when rate limit is exceeded."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str = "Rate limit exceeded. Please try again later.",
@@ -290,6 +260,8 @@ class RateLimitError(APIError):
 class ExternalServiceError(APIError):
     """Raised when an external service fails."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         service: str,
@@ -316,6 +288,8 @@ class ExternalServiceError(APIError):
 class InternalError(APIError):
     """Raised for internal server errors. Never expose details to clients."""
 
+    __slots__ = ("log_message",)
+
     def __init__(
         self,
         message: str = "An internal error occurred. Please try again later.",
@@ -8,55 +8,69 @@ Provides:
 """
 
 import time
-import uuid
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from secrets import token_hex
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
+class RequestContextMiddleware:
     """
     Middleware to add request context (ID, timing) to all requests.
 
+    Implemented as plain ASGI rather than BaseHTTPMiddleware so requests
+    don't pay for the extra task and body stream it wraps around call_next.
+
     Adds headers:
     - X-Request-ID: Unique identifier for request tracing
     - X-Response-Time: Processing time in milliseconds
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate or use existing request ID
-        request_id = request.headers.get("X-Request-ID")
-        if not request_id:
-            request_id = f"req_{uuid.uuid4().hex[:16]}"
+        request_id = Headers(scope=scope).get("X-Request-ID") or f"req_{token_hex(8)}"
 
         # Store in request state for access in route handlers
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
         # Track request timing
         start_time = time.perf_counter()
+        status_code = 500
+        process_time = 0.0
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code, process_time
+            if message["type"] == "http.response.start":
+                # Calculate processing time
+                process_time = (time.perf_counter() - start_time) * 1000  # ms
+                status_code = message["status"]
+
+                # Add headers to response
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Response-Time"] = f"{process_time:.2f}ms"
+            await send(message)
 
         # Process request
-        response = await call_next(request)
-
-        # Calculate processing time
-        process_time = (time.perf_counter() - start_time) * 1000  # ms
-
-        # Add headers to response
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Response-Time"] = f"{process_time:.2f}ms"
+        await self.app(scope, receive, send_with_context)
 
         # Log request (in production, use structured logging)
         logger.info(
-            f"[{request_id}] {request.method} {request.url.path} "
-            f"- {response.status_code} ({process_time:.2f}ms)"
+            "[%s] %s %s - %s (%.2fms)",
+            request_id, scope["method"], scope["path"], status_code, process_time,
         )
 
-        return response
-
 
 def get_request_id(request: Request) -> str:
     """Get request ID from request state."""
-    return getattr(request.state, "request_id", f"req_{uuid.uuid4().hex[:16]}")
+    return getattr(request.state, "request_id", None) or f"req_{token_hex(8)}"
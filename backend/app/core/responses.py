@@ -8,13 +8,18 @@ Following industry standards from Google, Microsoft, and Stripe APIs:
 - Request tracking
 """
 
-from datetime import datetime
-from typing import Optional, List, Any, Generic, TypeVar
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Optional, List, Generic, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar("T")
 
 
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (``datetime.utcnow`` is deprecated)."""
+    return datetime.now(timezone.utc)
+
+
 class ErrorDetail(BaseModel):
     """
     Detailed error information following Stripe/Google patterns.
@@ -50,10 +55,10 @@ class ErrorResponse(BaseModel):
     """
     error: ErrorDetail
     request_id: str = Field(..., description="Unique request identifier for debugging")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "error": {
                     "code": "resource_not_found",
@@ -64,6 +69,7 @@ class ErrorResponse(BaseModel):
                 "timestamp": "2024-01-15T10:30:00Z"
             }
         }
+    )
 
 
 class MessageResponse(BaseModel):
@@ -81,13 +87,14 @@ class MessageResponse(BaseModel):
     message: str
     request_id: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "message": "Operation completed successfully",
                 "request_id": "req_xyz789"
             }
         }
+    )
 
 
 class SuccessResponse(BaseModel, Generic[T]):
@@ -103,9 +110,9 @@ class SuccessResponse(BaseModel, Generic[T]):
             "timestamp": "2024-01-15T10:30:00Z"
         }
     """
-    data: Any
+    data: T
     request_id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class PaginationMeta(BaseModel):
@@ -136,24 +143,33 @@ class PaginatedResponse(BaseModel, Generic[T]):
             "request_id": "req_abc123"
         }
     """
-    data: List[Any]
+    data: List[T]
     pagination: PaginationMeta
     request_id: Optional[str] = None
 
     @classmethod
     def create(
         cls,
-        items: List[Any],
+        items: List[T],
         total: int,
         page: int,
         per_page: int,
         request_id: Optional[str] = None,
-    ) -> "PaginatedResponse":
-        """Factory method to create paginated response."""
-        total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
-        return cls(
+    ) -> "PaginatedResponse[T]":
+        """
+        Factory method to create paginated response.
+
+        Skips validation: page/per_page are expected to come from already
+        validated query parameters, and total from a COUNT query.
+        """
+        total_pages = 0
+        if per_page > 0:
+            total_pages, remainder = divmod(total, per_page)
+            if remainder:
+                total_pages += 1
+        return cls.model_construct(
             data=items,
-            pagination=PaginationMeta(
+            pagination=PaginationMeta.model_construct(
                 page=page,
                 per_page=per_page,
                 total=total,
@@ -174,16 +190,32 @@ class ResponseMessages:
     LOGGED_OUT = "Successfully logged out"
     EMAIL_VERIFIED = "Email verified successfully"
 
-    # Resources
-    CREATED = "{resource} created successfully"
-    UPDATED = "{resource} updated successfully"
-    DELETED = "{resource} deleted successfully"
-
     # Operations
-    REORDER_SUCCESS = "{resource} reordered successfully"
     SYNC_SUCCESS = "Sync completed successfully"
     EXPORT_SUCCESS = "Export completed successfully"
 
+    # Resources
+    @staticmethod
+    def created(resource: str) -> str:
+        return f"{resource} created successfully"
+
+    @staticmethod
+    def updated(resource: str) -> str:
+        return f"{resource} updated successfully"
+
+    @staticmethod
+    def deleted(resource: str) -> str:
+        return f"{resource} deleted successfully"
+
+    @staticmethod
+    def reordered(resource: str) -> str:
+        return f"{resource} reordered successfully"
+
     # Integrations
-    CONNECTED = "{service} connected successfully"
-    DISCONNECTED = "{service} disconnected successfully"
+    @staticmethod
+    def connected(service: str) -> str:
+        return f"{service} connected successfully"
+
+    @staticmethod
+    def disconnected(service: str) -> str:
+        return f"{service} disconnected successfully"
@@ -10,10 +10,21 @@ settings = get_settings()
 engine_kwargs = {
     "echo": settings.debug,
     "pool_pre_ping": True,
-    "pool_size": 5,
-    "max_overflow": 10,
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
 }
 
+if settings.database_url_async.startswith("postgresql+asyncpg"):
+    engine_kwargs["connect_args"] = {
+        # Reuse prepared statements for the hot, repeated queries.
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        # Short OLTP queries don't benefit from JIT compilation.
+        "server_settings": {"jit": "off"},
+    }
+
 # Asynchronous engine (for API operations)
 async_engine = create_async_engine(
     settings.database_url_async,
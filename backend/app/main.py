@@ -1,11 +1,13 @@
 """FastAPI Application Entry Point."""
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError as PydanticValidationError
 
@@ -25,21 +27,40 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with a Z suffix for response bodies."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("Starting Glide API...")
 
+    # The Procfile/Dockerfile run uvicorn with --loop uvloop; flag launches that don't
+    if not type(asyncio.get_running_loop()).__module__.startswith("uvloop"):
+        logger.warning("Running on the default asyncio event loop; start uvicorn with --loop uvloop")
+
     # Create database tables
     if settings.debug:
         await init_db()
         logger.info("Database tables created")
 
+    # Pooled client for Google's OAuth token endpoint (see get_google_http)
+    app.state.google_http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0,
+    )
+    # Pooled client for Supabase Storage (see get_storage_service)
+    app.state.storage_http = httpx.AsyncClient()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Glide API...")
+    await app.state.google_http.aclose()
+    await app.state.storage_http.aclose()
     await close_db()
 
 
@@ -48,6 +69,7 @@ app = FastAPI(
     description="Voice memo to action - AI-powered note taking",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add request context middleware (must be added before CORS)
@@ -69,7 +91,7 @@ app.add_middleware(
 # =============================================================================
 
 @app.exception_handler(APIError)
-async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
+async def api_error_handler(request: Request, exc: APIError) -> ORJSONResponse:
     """
     Handle custom API errors with standardized response format.
 
@@ -89,16 +111,16 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
 
     # Log error for debugging
     logger.warning(
-        f"[{request_id}] API Error: {exc.code.value} - {exc.message}"
+        "[%s] API Error: %s - %s", request_id, exc.code.value, exc.message
     )
 
     response_content = {
         "error": exc.to_dict(),
         "request_id": request_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
     }
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=response_content,
         headers=exc.headers,
@@ -108,7 +130,7 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
 @app.exception_handler(RequestValidationError)
 async def validation_error_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Handle Pydantic/FastAPI validation errors with standardized format.
 
@@ -116,22 +138,13 @@ async def validation_error_handler(
     """
     request_id = get_request_id(request)
 
-    # Extract validation error details
+    # Extract validation error details (Pydantic v2 errors always carry loc/msg)
     errors = exc.errors()
-    details = []
-    param = None
+    details = [f"{' -> '.join(map(str, e['loc']))}: {e['msg']}" for e in errors]
+    # The first field name is the main param
+    param = next((str(e["loc"][-1]) for e in errors if e["loc"]), None)
 
-    for error in errors:
-        loc = " -> ".join(str(l) for l in error.get("loc", []))
-        msg = error.get("msg", "Invalid value")
-        details.append(f"{loc}: {msg}")
-        if param is None and error.get("loc"):
-            # Get the first field name as the main param
-            param = str(error["loc"][-1]) if error["loc"] else None
-
-    logger.warning(
-        f"[{request_id}] Validation Error: {details}"
-    )
+    logger.warning("[%s] Validation Error: %s", request_id, details)
 
     response_content = {
         "error": {
@@ -141,10 +154,10 @@ async def validation_error_handler(
             "details": details,
         },
         "request_id": request_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
     }
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=response_content,
     )
@@ -153,15 +166,13 @@ async def validation_error_handler(
 @app.exception_handler(PydanticValidationError)
 async def pydantic_validation_error_handler(
     request: Request, exc: PydanticValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle Pydantic validation errors."""
     request_id = get_request_id(request)
 
     details = [f"{e['loc']}: {e['msg']}" for e in exc.errors()]
 
-    logger.warning(
-        f"[{request_id}] Pydantic Validation Error: {details}"
-    )
+    logger.warning("[%s] Pydantic Validation Error: %s", request_id, details)
 
     response_content = {
         "error": {
@@ -170,17 +181,17 @@ async def pydantic_validation_error_handler(
             "details": details,
         },
         "request_id": request_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
     }
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=response_content,
     )
 
 
 @app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def global_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     Global exception handler for unexpected errors.
 
@@ -190,7 +201,7 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
 
     # Log full error for debugging (with stack trace)
     logger.exception(
-        f"[{request_id}] Unhandled Exception: {type(exc).__name__}: {str(exc)}"
+        "[%s] Unhandled Exception: %s: %s", request_id, type(exc).__name__, exc
     )
 
     # In debug mode, include more details (but still safe for client)
@@ -207,13 +218,13 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
             "message": message,
         },
         "request_id": request_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
     }
 
     if details:
         response_content["error"]["details"] = details
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=response_content,
     )
@@ -282,6 +293,6 @@ async def health_check(request: Request):
     return {
         "status": "healthy",
         "database": "connected",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
         "request_id": get_request_id(request),
     }
@@ -1,8 +1,7 @@
 """Action model for calendar events, emails, reminders."""
 import uuid
-from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -37,14 +36,18 @@ class Action(Base):
     """Action model for tasks extracted from voice memos."""
 
     __tablename__ = "actions"
+    # Fetch server-generated timestamps via RETURNING instead of a lazy reload.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     note_id = Column(UUID(as_uuid=True), ForeignKey("notes.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Action details
-    action_type = Column(SQLEnum(ActionType), nullable=False, index=True)
-    status = Column(SQLEnum(ActionStatus), default=ActionStatus.PENDING)
-    priority = Column(SQLEnum(ActionPriority), default=ActionPriority.MEDIUM)
+    # VARCHAR + CHECK rather than native PG enums: adding a member is a
+    # constraint swap instead of ALTER TYPE, and no enum OID introspection.
+    action_type = Column(SQLEnum(ActionType, native_enum=False, length=20, create_constraint=True), nullable=False, index=True)
+    status = Column(SQLEnum(ActionStatus, native_enum=False, length=20, create_constraint=True), default=ActionStatus.PENDING)
+    priority = Column(SQLEnum(ActionPriority, native_enum=False, length=20, create_constraint=True), default=ActionPriority.MEDIUM)
 
     # Content
     title = Column(String(500), nullable=False)
@@ -68,8 +71,8 @@ class Action(Base):
     external_url = Column(String(500), nullable=True)  # Link to external resource
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     executed_at = Column(DateTime, nullable=True)
 
     # Relationships
@@ -1,7 +1,6 @@
 """Note and Folder models."""
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import DDL, Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index, event, func, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 
@@ -12,6 +11,13 @@ class Folder(Base):
     """Folder model for organizing notes."""
 
     __tablename__ = "folders"
+    __table_args__ = (
+        # Folder names are unique per user; also the conflict target for
+        # get_or_create_folder_id's upsert.
+        Index("uq_folders_user_name", "user_id", "name", unique=True),
+    )
+    # Fetch server-generated timestamps via RETURNING instead of a lazy reload.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -25,8 +31,8 @@ class Folder(Base):
     parent_id = Column(UUID(as_uuid=True), ForeignKey("folders.id", ondelete="CASCADE"), nullable=True, index=True)
     depth = Column(Integer, default=0)  # 0 = root, 1 = child, 2 = grandchild (max)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="folders")
@@ -44,6 +50,42 @@ class Note(Base):
     """Note model for voice memos and transcriptions."""
 
     __tablename__ = "notes"
+    __table_args__ = (
+        # Serves the per-folder note counts in list_folders/get_folder as an
+        # index-only scan over live notes.
+        Index(
+            "idx_notes_user_folder_active",
+            "user_id",
+            "folder_id",
+            postgresql_where=text("is_deleted = false"),
+            postgresql_include=["id", "is_archived"],
+        ),
+        # Matches the list endpoints' filter and pinned-first, newest-first
+        # order, so a page is an ordered index scan that stops at LIMIT.
+        Index(
+            "idx_notes_user_feed",
+            "user_id",
+            "is_archived",
+            text("is_pinned DESC"),
+            text("created_at DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Trigram indexes let the '%q%' ILIKE searches avoid a sequential scan.
+        Index(
+            "idx_notes_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_notes_transcript_trgm",
+            "transcript",
+            postgresql_using="gin",
+            postgresql_ops={"transcript": "gin_trgm_ops"},
+        ),
+    )
+    # Fetch server-generated timestamps via RETURNING instead of a lazy reload.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -71,8 +113,8 @@ class Note(Base):
     ai_metadata = Column(JSONB, default={})  # Store AI processing details
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="notes")
@@ -81,3 +123,11 @@ class Note(Base):
 
     def __repr__(self):
         return f"<Note {self.title[:50]}>"
+
+
+# gin_trgm_ops comes from pg_trgm; make sure it exists when create_all builds the table
+event.listen(
+    Note.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,19 +1,25 @@
 """Actions router for executing calendar, email, and reminder actions."""
+import asyncio
 import logging
-from datetime import datetime
+from functools import lru_cache
 from typing import Annotated, Optional, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+import httpx
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.database import get_db
 from app.models.user import User
-from app.models.action import Action, ActionType, ActionStatus
+from app.models.action import Action, ActionType, ActionStatus, ActionPriority
+from app.models.note import Note
 from app.routers.auth import get_current_user
+from app.routers.integrations import get_google_http, get_valid_google_access_token
 from app.services.google_services import GoogleCalendarService, GmailService
-from app.services.apple_services import AppleCalendarService, AppleRemindersService
+from app.services.apple_services import AppleCalendarService, AppleRemindersService, run_caldav
 from app.utils import decrypt_token
 from app.schemas.action_schemas import (
     ActionResponse,
@@ -27,6 +33,33 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# iCalendar VTODO priority: 1 = highest, 5 = medium, 9 = lowest
+APPLE_REMINDER_PRIORITY = {
+    ActionPriority.HIGH: 1,
+    ActionPriority.MEDIUM: 5,
+    ActionPriority.LOW: 9,
+}
+
+_ACTION_LIST_ADAPTER = TypeAdapter(List[ActionResponse])
+
+
+async def _get_user_action(db: AsyncSession, action_id: UUID, user_id: UUID) -> Action:
+    """Load an action owned by the user (via its note) or raise NotFoundError."""
+    # lambda_stmt caches the constructed statement; only the bound IDs vary per call.
+    stmt = lambda_stmt(
+        lambda: select(Action)
+        .join(Note, Action.note_id == Note.id)
+        .where(Action.id == action_id, Note.user_id == user_id)
+        .options(raiseload(Action.note))
+    )
+    result = await db.execute(stmt)
+    action = result.scalar_one_or_none()
+
+    if not action:
+        raise NotFoundError(resource="action", identifier=str(action_id))
+
+    return action
+
 
 @router.get("", response_model=List[ActionResponse])
 async def list_actions(
@@ -40,8 +73,9 @@ async def list_actions(
     """List actions with optional filters."""
     query = (
         select(Action)
-        .join(Action.note)
-        .where(Action.note.has(user_id=current_user.id))
+        .join(Note, Action.note_id == Note.id)
+        .where(Note.user_id == current_user.id)
+        .options(raiseload(Action.note))
     )
 
     if note_id:
@@ -56,9 +90,11 @@ async def list_actions(
     query = query.order_by(Action.created_at.desc()).limit(limit)
 
     result = await db.execute(query)
-    actions = result.scalars().all()
 
-    return [ActionResponse.model_validate(a) for a in actions]
+    # Validate and serialize the whole list in pydantic-core; response_model
+    # stays on the route for the OpenAPI schema only.
+    actions = _ACTION_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
+    return Response(content=_ACTION_LIST_ADAPTER.dump_json(actions), media_type="application/json")
 
 
 @router.get("/{action_id}", response_model=ActionResponse)
@@ -68,16 +104,7 @@ async def get_action(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single action by ID."""
-    result = await db.execute(
-        select(Action)
-        .join(Action.note)
-        .where(Action.id == action_id)
-        .where(Action.note.has(user_id=current_user.id))
-    )
-    action = result.scalar_one_or_none()
-
-    if not action:
-        raise NotFoundError(resource="action", identifier=str(action_id))
+    action = await _get_user_action(db, action_id, current_user.id)
 
     return ActionResponse.model_validate(action)
 
@@ -90,24 +117,13 @@ async def update_action(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an action."""
-    result = await db.execute(
-        select(Action)
-        .join(Action.note)
-        .where(Action.id == action_id)
-        .where(Action.note.has(user_id=current_user.id))
-    )
-    action = result.scalar_one_or_none()
-
-    if not action:
-        raise NotFoundError(resource="action", identifier=str(action_id))
+    action = await _get_user_action(db, action_id, current_user.id)
 
     update_data = action_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(action, field, value)
 
-    action.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(action)
 
     return ActionResponse.model_validate(action)
 
@@ -119,16 +135,7 @@ async def delete_action(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete an action."""
-    result = await db.execute(
-        select(Action)
-        .join(Action.note)
-        .where(Action.id == action_id)
-        .where(Action.note.has(user_id=current_user.id))
-    )
-    action = result.scalar_one_or_none()
-
-    if not action:
-        raise NotFoundError(resource="action", identifier=str(action_id))
+    action = await _get_user_action(db, action_id, current_user.id)
 
     await db.delete(action)
     await db.commit()
@@ -140,20 +147,12 @@ async def execute_action(
     request: ActionExecuteRequest,
     current_user: Annotated[User, Depends(get_current_user)],
     db: AsyncSession = Depends(get_db),
+    google_http: httpx.AsyncClient = Depends(get_google_http),
 ):
     """
     Execute an action (create calendar event, email draft, reminder).
     """
-    result = await db.execute(
-        select(Action)
-        .join(Action.note)
-        .where(Action.id == action_id)
-        .where(Action.note.has(user_id=current_user.id))
-    )
-    action = result.scalar_one_or_none()
-
-    if not action:
-        raise NotFoundError(resource="action", identifier=str(action_id))
+    action = await _get_user_action(db, action_id, current_user.id)
 
     if action.status == ActionStatus.EXECUTED:
         raise ConflictError(
@@ -165,25 +164,26 @@ async def execute_action(
     service = request.service.lower()
 
     try:
-        if action.action_type == ActionType.CALENDAR:
-            result = await _execute_calendar_action(action, current_user, service)
-        elif action.action_type == ActionType.EMAIL:
-            result = await _execute_email_action(action, current_user, service)
-        elif action.action_type == ActionType.REMINDER:
-            result = await _execute_reminder_action(action, current_user, service)
-        else:
+        executor = ACTION_EXECUTORS.get(action.action_type)
+        if executor is None:
             raise ValidationError(
                 message=f"Cannot execute action type: {action.action_type}",
                 code=ErrorCode.VALIDATION_INVALID_VALUE,
                 param="action_type",
             )
+        if service == "google" and current_user.google_access_token:
+            # Refresh (and persist) an expiring token before the cached client
+            # is looked up, so clients are keyed on the token actually in use
+            await get_valid_google_access_token(current_user, db, google_http)
+        result = await executor(action, current_user, service)
 
         # Update action status
         action.status = ActionStatus.EXECUTED
         action.external_id = result.get("id") or result.get("uid")
         action.external_service = service
         action.external_url = result.get("html_link") or result.get("url")
-        action.executed_at = datetime.utcnow()
+        # Stamped by the database clock, like created_at and updated_at
+        action.executed_at = func.now()
 
         await db.commit()
 
@@ -207,15 +207,42 @@ async def execute_action(
         )
 
 
+# Service clients are cached per user, keyed on the stored (encrypted)
+# credentials: construction runs Google discovery or a CalDAV principal lookup,
+# so callers build them off the event loop, and a reconnect or token refresh
+# changes the key, so stale clients age out. Google clients get no refresh
+# token: execute_action refreshes and persists the access token first, and
+# google-auth can't swap credentials inside a cached client.
+# The Apple calendar client is also reused by the integrations test endpoint.
+@lru_cache(maxsize=256)
+def _google_calendar_service(user_id: UUID, access_token: str) -> GoogleCalendarService:
+    return GoogleCalendarService(access_token=decrypt_token(access_token))
+
+
+@lru_cache(maxsize=256)
+def _gmail_service(user_id: UUID, access_token: str) -> GmailService:
+    return GmailService(access_token=decrypt_token(access_token))
+
+
+@lru_cache(maxsize=256)
+def get_apple_calendar_service(user_id: UUID, username: str, app_password: str) -> AppleCalendarService:
+    return AppleCalendarService(username=username, app_password=decrypt_token(app_password))
+
+
+@lru_cache(maxsize=256)
+def _apple_reminders_service(user_id: UUID, username: str, app_password: str) -> AppleRemindersService:
+    return AppleRemindersService(username=username, app_password=decrypt_token(app_password))
+
+
 async def _execute_calendar_action(action: Action, user: User, service: str) -> dict:
     """Execute a calendar action."""
     if service == "google":
         if not user.google_access_token:
             raise ValueError("Google Calendar not connected")
 
-        calendar_service = GoogleCalendarService(
-            access_token=decrypt_token(user.google_access_token),
-            refresh_token=decrypt_token(user.google_refresh_token),
+        # A cache miss runs Google API discovery over HTTP
+        calendar_service = await asyncio.to_thread(
+            _google_calendar_service, user.id, user.google_access_token
         )
 
         return await calendar_service.create_event(
@@ -232,9 +259,9 @@ async def _execute_calendar_action(action: Action, user: User, service: str) ->
         if not user.apple_caldav_username or not user.apple_caldav_password:
             raise ValueError("Apple Calendar not connected")
 
-        calendar_service = AppleCalendarService(
-            username=user.apple_caldav_username,
-            app_password=decrypt_token(user.apple_caldav_password),
+        # A cache miss connects and looks up the CalDAV principal
+        calendar_service = await run_caldav(
+            get_apple_calendar_service, user.id, user.apple_caldav_username, user.apple_caldav_password
         )
 
         return await calendar_service.create_event(
@@ -257,10 +284,7 @@ async def _execute_email_action(action: Action, user: User, service: str) -> dic
     if not user.google_access_token:
         raise ValueError("Gmail not connected")
 
-    gmail_service = GmailService(
-        access_token=decrypt_token(user.google_access_token),
-        refresh_token=decrypt_token(user.google_refresh_token),
-    )
+    gmail_service = await asyncio.to_thread(_gmail_service, user.id, user.google_access_token)
 
     return await gmail_service.create_draft(
         to=action.email_to,
@@ -275,16 +299,11 @@ async def _execute_reminder_action(action: Action, user: User, service: str) ->
         if not user.apple_caldav_username or not user.apple_caldav_password:
             raise ValueError("Apple Reminders not connected")
 
-        reminders_service = AppleRemindersService(
-            username=user.apple_caldav_username,
-            app_password=decrypt_token(user.apple_caldav_password),
+        reminders_service = await run_caldav(
+            _apple_reminders_service, user.id, user.apple_caldav_username, user.apple_caldav_password
         )
 
-        priority = 5  # medium
-        if action.priority.value == "high":
-            priority = 1
-        elif action.priority.value == "low":
-            priority = 9
+        priority = APPLE_REMINDER_PRIORITY.get(action.priority, 5)
 
         return await reminders_service.create_reminder(
             title=action.title,
@@ -297,6 +316,13 @@ async def _execute_reminder_action(action: Action, user: User, service: str) ->
         raise ValueError(f"Reminders not supported for service: {service}")
 
 
+ACTION_EXECUTORS = {
+    ActionType.CALENDAR: _execute_calendar_action,
+    ActionType.EMAIL: _execute_email_action,
+    ActionType.REMINDER: _execute_reminder_action,
+}
+
+
 @router.post("/{action_id}/complete", response_model=ActionResponse)
 async def complete_action(
     action_id: UUID,
@@ -304,20 +330,11 @@ async def complete_action(
     db: AsyncSession = Depends(get_db),
 ):
     """Mark an action as complete (for next_steps and reminders)."""
-    result = await db.execute(
-        select(Action)
-        .join(Action.note)
-        .where(Action.id == action_id)
-        .where(Action.note.has(user_id=current_user.id))
-    )
-    action = result.scalar_one_or_none()
-
-    if not action:
-        raise NotFoundError(resource="action", identifier=str(action_id))
+    action = await _get_user_action(db, action_id, current_user.id)
 
     action.status = ActionStatus.EXECUTED
-    action.executed_at = datetime.utcnow()
+    action.executed_at = func.now()
     await db.commit()
-    await db.refresh(action)
+    await db.refresh(action, attribute_names=["executed_at"])
 
     return ActionResponse.model_validate(action)
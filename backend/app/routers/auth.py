@@ -1,14 +1,12 @@
 """Authentication router."""
 import logging
-from datetime import datetime
 from typing import Annotated, Optional
 from uuid import UUID
-import secrets
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
@@ -27,8 +25,11 @@ from app.utils.auth import (
     create_access_token,
     create_refresh_token,
     verify_token,
+    make_unusable_password,
+    run_kdf,
 )
 from app.utils.supabase_auth import verify_supabase_jwt
+from app.utils.auth_cache import get_cached_user_id, cache_user_id, invalidate_user_tokens
 from app.utils.apple import verify_apple_identity_token
 from app.config import get_settings
 from app.core.errors import (
@@ -63,13 +64,30 @@ settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# UserResponse fields read straight off the User row
+_USER_RESPONSE_COLUMNS = tuple(
+    f for f in UserResponse.model_fields if f not in ("google_connected", "apple_connected")
+)
+
+# Hot user lookups, built once at import; each call only binds the value.
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USER_BY_SUPABASE_ID = select(User).where(User.supabase_user_id == bindparam("supabase_user_id"))
+
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user from JWT token."""
+    # Token already verified within the last few seconds: skip re-verification
+    cached_user_id = get_cached_user_id(token)
+    if cached_user_id is not None:
+        user = await db.get(User, cached_user_id)
+        if user is not None and user.is_active:
+            return user
+
     user = None
+    payload = None
     # Try Supabase JWT first if configured
     if settings.supabase_url:
         try:
@@ -88,7 +106,7 @@ async def get_current_user(
                 )
 
             result = await db.execute(
-                select(User).where(User.supabase_user_id == UUID(supabase_user_id))
+                _USER_BY_SUPABASE_ID, {"supabase_user_id": UUID(supabase_user_id)}
             )
             user = result.scalar_one_or_none()
 
@@ -114,7 +132,6 @@ async def get_current_user(
                 )
                 db.add(user)
                 await db.commit()
-                await db.refresh(user)
             else:
                 # Keep provider flags in sync if the user authenticates with a new provider
                 updated = False
@@ -153,10 +170,7 @@ async def get_current_user(
                 code=ErrorCode.AUTH_INVALID_TOKEN,
             )
 
-        result = await db.execute(
-            select(User).where(User.id == UUID(user_id))
-        )
-        user = result.scalar_one_or_none()
+        user = await db.get(User, UUID(user_id))
 
     if user is None:
         raise AuthenticationError(
@@ -170,6 +184,7 @@ async def get_current_user(
             code=ErrorCode.PERMISSION_ACCOUNT_INACTIVE,
         )
 
+    cache_user_id(token, user.id, exp=payload.get("exp") if payload else None)
     return user
 
 
@@ -180,9 +195,7 @@ async def register(
 ):
     """Register a new user."""
     # Check if email already exists
-    result = await db.execute(
-        select(User).where(User.email == user_data.email)
-    )
+    result = await db.execute(_USER_BY_EMAIL, {"email": user_data.email})
     if result.scalar_one_or_none():
         raise ConflictError(
             message="Email already registered",
@@ -193,12 +206,11 @@ async def register(
     # Create user
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await run_kdf(get_password_hash, user_data.password),
         full_name=user_data.full_name,
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     return user
 
@@ -210,12 +222,10 @@ async def login(
 ):
     """Login and get access token."""
     # Find user by email
-    result = await db.execute(
-        select(User).where(User.email == form_data.username)
-    )
+    result = await db.execute(_USER_BY_EMAIL, {"email": form_data.username})
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await run_kdf(verify_password, form_data.password, user.hashed_password):
         raise ValidationError(
             message="Incorrect email or password",
             code=ErrorCode.VALIDATION_INVALID_CREDENTIALS,
@@ -253,10 +263,7 @@ async def refresh_token_endpoint(
         )
 
     user_id = payload.get("sub")
-    result = await db.execute(
-        select(User).where(User.id == UUID(user_id))
-    )
-    user = result.scalar_one_or_none()
+    user = await db.get(User, UUID(user_id))
 
     if not user:
         raise AuthenticationError(
@@ -287,11 +294,13 @@ async def get_me(
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """Get current user profile."""
-    # Add integration status
-    response = UserResponse.model_validate(current_user)
-    response.google_connected = bool(current_user.google_access_token)
-    response.apple_connected = bool(current_user.apple_caldav_password)
-    return response
+    # Columns come from the ORM row we just loaded; skip re-validating them
+    return UserResponse.model_construct(
+        **{field: getattr(current_user, field) for field in _USER_RESPONSE_COLUMNS},
+        # Add integration status
+        google_connected=bool(current_user.google_access_token),
+        apple_connected=bool(current_user.apple_caldav_password),
+    )
 
 
 @router.patch("/me", response_model=UserResponse)
@@ -306,9 +315,7 @@ async def update_me(
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
-    current_user.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(current_user)
 
     return current_user
 
@@ -321,16 +328,18 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change user password."""
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await run_kdf(
+        verify_password, password_data.current_password, current_user.hashed_password
+    ):
         raise ValidationError(
             message="Incorrect current password",
             code=ErrorCode.VALIDATION_INVALID_CREDENTIALS,
             param="current_password",
         )
 
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    current_user.updated_at = datetime.utcnow()
+    current_user.hashed_password = await run_kdf(get_password_hash, password_data.new_password)
     await db.commit()
+    invalidate_user_tokens(current_user.id)
 
     return MessageResponse(
         message="Password changed successfully",
@@ -347,6 +356,7 @@ async def logout(
     # In a more complete implementation, you might:
     # - Add the token to a blacklist
     # - Invalidate refresh tokens in database
+    invalidate_user_tokens(current_user.id)
     return MessageResponse(
         message="Successfully logged out",
         request_id=get_request_id(request),
@@ -379,25 +389,20 @@ async def apple_sign_in(
         # Try to find existing user by email
         user = None
         if email:
-            result = await db.execute(
-                select(User).where(User.email == email)
-            )
+            result = await db.execute(_USER_BY_EMAIL, {"email": email})
             user = result.scalar_one_or_none()
 
         if not user:
             # Create a new user
-            # Generate a random password since they're using Apple Sign-In
-            random_password = secrets.token_urlsafe(32)
-
             user = User(
                 email=email or f"apple_{apple_user_id}@privaterelay.appleid.com",
-                hashed_password=get_password_hash(random_password),
+                # Apple Sign-In users have no password
+                hashed_password=make_unusable_password(),
                 full_name=apple_data.full_name,
                 is_verified=token_payload.email_verified,
             )
             db.add(user)
             await db.commit()
-            await db.refresh(user)
 
         # Create tokens
         access_token = create_access_token(subject=str(user.id))
@@ -1,11 +1,12 @@
 """Folders router."""
 import logging
-from datetime import datetime
-from typing import Annotated, List
+from typing import Annotated, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy import select, func, update
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -21,12 +22,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_FOLDER_TREE_ADAPTER = TypeAdapter(List[FolderResponse])
+
 
 def build_folder_tree(folders: List[Folder], counts: dict, total_count: int) -> List[FolderResponse]:
-    """Build hierarchical tree structure from flat folder list."""
-    # Create a dict for quick lookup
+    """
+    Build hierarchical tree structure from flat folder list.
+
+    Expects folders ordered by (depth, sort_order, name), as list_folders
+    queries them: parents come before their children and each children list
+    is filled already sorted, so the tree is built in one pass with no re-sort.
+    """
     folder_map = {}
+    root_folders = []
     for folder in folders:
+        # For "All Notes" system folder, show total count
+        if folder.name == "All Notes" and folder.is_system:
+            note_count = total_count
+        else:
+            note_count = counts.get(folder.id, 0)
+
         folder_response = FolderResponse(
             id=folder.id,
             name=folder.name,
@@ -38,34 +53,45 @@ def build_folder_tree(folders: List[Folder], counts: dict, total_count: int) ->
             depth=folder.depth,
             children=[],
             created_at=folder.created_at,
-            note_count=0,
+            note_count=note_count,
         )
-        # For "All Notes" system folder, show total count
-        if folder.name == "All Notes" and folder.is_system:
-            folder_response.note_count = total_count
-        else:
-            folder_response.note_count = counts.get(folder.id, 0)
         folder_map[folder.id] = folder_response
 
-    # Build tree structure
-    root_folders = []
-    for folder in folders:
-        folder_response = folder_map[folder.id]
-        if folder.parent_id and folder.parent_id in folder_map:
+        parent = folder_map.get(folder.parent_id) if folder.parent_id else None
+        if parent is not None:
             # Add to parent's children
-            folder_map[folder.parent_id].children.append(folder_response)
+            parent.children.append(folder_response)
         else:
             # Root level folder
             root_folders.append(folder_response)
 
-    # Sort children by sort_order
-    for folder_response in folder_map.values():
-        folder_response.children.sort(key=lambda f: (f.sort_order, f.name))
+    return root_folders
+
 
-    # Sort root folders by sort_order
-    root_folders.sort(key=lambda f: (f.sort_order, f.name))
+async def _get_user_folder(db: AsyncSession, folder_id: UUID, user_id: UUID) -> Folder:
+    """Load a folder owned by the user by primary key or raise NotFoundError."""
+    folder = await db.get(Folder, folder_id)
 
-    return root_folders
+    if not folder or folder.user_id != user_id:
+        raise NotFoundError(resource="folder", identifier=str(folder_id))
+
+    return folder
+
+
+async def get_or_create_folder_id(db: AsyncSession, user_id: UUID, name: str) -> UUID:
+    """
+    Return the ID of the user's folder with this name, creating it if missing.
+
+    One INSERT ... ON CONFLICT (user_id, name) DO UPDATE ... RETURNING covers
+    both the hit and the miss, and two concurrent callers can't create the
+    same folder twice.
+    """
+    stmt = postgresql.insert(Folder).values(user_id=user_id, name=name, icon="folder.fill")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Folder.user_id, Folder.name],
+        set_={"name": stmt.excluded.name},
+    ).returning(Folder.id)
+    return (await db.execute(stmt)).scalar_one()
 
 
 @router.get("", response_model=List[FolderResponse])
@@ -92,17 +118,13 @@ async def list_folders(
     )
     counts = dict(count_result.all())
 
-    # Get total note count for "All Notes" folder
-    total_result = await db.execute(
-        select(func.count(Note.id))
-        .where(Note.user_id == current_user.id)
-        .where(Note.is_deleted == False)
-        .where(Note.is_archived == False)
-    )
-    total_count = total_result.scalar() or 0
+    # Total for "All Notes": the groups (including folder_id NULL) cover every note
+    total_count = sum(counts.values())
 
-    # Build and return hierarchical tree
-    return build_folder_tree(list(folders), counts, total_count)
+    # The tree is built from validated FolderResponse nodes, so dump it straight
+    # to JSON; response_model stays on the route for the OpenAPI schema only.
+    tree = build_folder_tree(list(folders), counts, total_count)
+    return Response(content=_FOLDER_TREE_ADAPTER.dump_json(tree), media_type="application/json")
 
 
 @router.get("/{folder_id}", response_model=FolderResponse)
@@ -112,15 +134,7 @@ async def get_folder(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single folder."""
-    result = await db.execute(
-        select(Folder)
-        .where(Folder.id == folder_id)
-        .where(Folder.user_id == current_user.id)
-    )
-    folder = result.scalar_one_or_none()
-
-    if not folder:
-        raise NotFoundError(resource="folder", identifier=str(folder_id))
+    folder = await _get_user_folder(db, folder_id, current_user.id)
 
     # Get note count
     count_result = await db.execute(
@@ -144,11 +158,7 @@ async def create_folder(
     """Create a new folder."""
     # Idempotency for offline-created folders
     if folder_data.client_id:
-        existing = await db.execute(
-            select(Folder)
-            .where(Folder.id == folder_data.client_id)
-        )
-        existing_folder = existing.scalar_one_or_none()
+        existing_folder = await db.get(Folder, folder_data.client_id)
         if existing_folder:
             if existing_folder.user_id != current_user.id:
                 raise ConflictError(
@@ -177,13 +187,11 @@ async def create_folder(
                 created_at=existing_folder.created_at,
             )
 
+    # Name and parent checks run against one load of the user's folders
+    user_folders = await _load_user_folders(db, current_user.id)
+
     # Check for duplicate name
-    result = await db.execute(
-        select(Folder)
-        .where(Folder.user_id == current_user.id)
-        .where(Folder.name == folder_data.name)
-    )
-    if result.scalar_one_or_none():
+    if any(f.name == folder_data.name for f in user_folders.values()):
         raise ConflictError(
             message="Folder with this name already exists",
             code=ErrorCode.CONFLICT_FOLDER_EXISTS,
@@ -194,12 +202,7 @@ async def create_folder(
     depth = 0
     parent_id = folder_data.parent_id
     if parent_id:
-        result = await db.execute(
-            select(Folder)
-            .where(Folder.id == parent_id)
-            .where(Folder.user_id == current_user.id)
-        )
-        parent = result.scalar_one_or_none()
+        parent = user_folders.get(parent_id)
         if not parent:
             raise NotFoundError(resource="folder", identifier=str(parent_id))
         if parent.is_system:
@@ -228,7 +231,6 @@ async def create_folder(
         folder.id = folder_data.client_id
     db.add(folder)
     await db.commit()
-    await db.refresh(folder)
 
     # Return response without lazy-loading children (new folder has no children)
     return FolderResponse(
@@ -246,35 +248,49 @@ async def create_folder(
     )
 
 
-async def get_folder_max_child_depth(db: AsyncSession, folder_id: UUID) -> int:
-    """Get the maximum depth of descendants for a folder."""
-    result = await db.execute(
-        select(func.max(Folder.depth))
-        .where(Folder.parent_id == folder_id)
-    )
-    max_child_depth = result.scalar()
-    if max_child_depth is None:
-        return 0
-    # Recursively check children
-    children_result = await db.execute(
-        select(Folder.id).where(Folder.parent_id == folder_id)
-    )
-    children_ids = [r[0] for r in children_result.all()]
-    for child_id in children_ids:
-        child_max = await get_folder_max_child_depth(db, child_id)
-        max_child_depth = max(max_child_depth, child_max)
-    return max_child_depth
+async def _load_user_folders(db: AsyncSession, user_id: UUID) -> Dict[UUID, Folder]:
+    """Load all of a user's folders as an {id: Folder} map (folder trees are small and shallow)."""
+    result = await db.execute(select(Folder).where(Folder.user_id == user_id))
+    return {f.id: f for f in result.scalars().all()}
 
 
-async def update_children_depth(db: AsyncSession, folder_id: UUID, new_depth: int):
-    """Recursively update depth of all children when parent moves."""
-    result = await db.execute(
-        select(Folder).where(Folder.parent_id == folder_id)
+def _descendant_ids(parent_by_id: Dict[UUID, Optional[UUID]], folder_id: UUID) -> List[UUID]:
+    """Get the IDs of all descendants of a folder from an {id: parent_id} map."""
+    descendants = []
+    pending = [folder_id]
+    while pending:
+        parent_id = pending.pop()
+        for child_id, child_parent_id in parent_by_id.items():
+            if child_parent_id == parent_id:
+                descendants.append(child_id)
+                pending.append(child_id)
+    return descendants
+
+
+def _get_descendants(folders_by_id: Dict[UUID, Folder], folder_id: UUID) -> List[Folder]:
+    """Get all descendants of a folder from a loaded {id: Folder} map."""
+    parent_by_id = {f.id: f.parent_id for f in folders_by_id.values()}
+    return [folders_by_id[i] for i in _descendant_ids(parent_by_id, folder_id)]
+
+
+async def _shift_descendant_depths(
+    db: AsyncSession, folders_by_id: Dict[UUID, Folder], folder_id: UUID, depth_change: int
+):
+    """
+    Shift the depth of all descendants by depth_change in a single UPDATE.
+
+    Descendants are found in the loaded {id: Folder} map, so the WHERE clause
+    can be evaluated in Python and those instances are kept in sync.
+    """
+    descendant_ids = [f.id for f in _get_descendants(folders_by_id, folder_id)]
+    if not depth_change or not descendant_ids:
+        return
+    await db.execute(
+        update(Folder)
+        .where(Folder.id.in_(descendant_ids))
+        .values(depth=Folder.depth + depth_change)
+        .execution_options(synchronize_session="evaluate")
     )
-    children = result.scalars().all()
-    for child in children:
-        child.depth = new_depth + 1
-        await update_children_depth(db, child.id, child.depth)
 
 
 @router.patch("/{folder_id}", response_model=FolderResponse)
@@ -285,12 +301,9 @@ async def update_folder(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a folder."""
-    result = await db.execute(
-        select(Folder)
-        .where(Folder.id == folder_id)
-        .where(Folder.user_id == current_user.id)
-    )
-    folder = result.scalar_one_or_none()
+    # All lookups below run against this one load
+    user_folders = await _load_user_folders(db, current_user.id)
+    folder = user_folders.get(folder_id)
 
     if not folder:
         raise NotFoundError(resource="folder", identifier=str(folder_id))
@@ -304,13 +317,7 @@ async def update_folder(
 
     # Check for duplicate name if changing
     if folder_data.name and folder_data.name != folder.name:
-        result = await db.execute(
-            select(Folder)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.name == folder_data.name)
-            .where(Folder.id != folder_id)
-        )
-        if result.scalar_one_or_none():
+        if any(f.name == folder_data.name and f.id != folder_id for f in user_folders.values()):
             raise ConflictError(
                 message="Folder with this name already exists",
                 code=ErrorCode.CONFLICT_FOLDER_EXISTS,
@@ -323,12 +330,7 @@ async def update_folder(
         new_parent_id = update_data['parent_id']
         if new_parent_id:
             # Validate new parent exists and belongs to user
-            result = await db.execute(
-                select(Folder)
-                .where(Folder.id == new_parent_id)
-                .where(Folder.user_id == current_user.id)
-            )
-            new_parent = result.scalar_one_or_none()
+            new_parent = user_folders.get(new_parent_id)
             if not new_parent:
                 raise NotFoundError(resource="folder", identifier=str(new_parent_id))
             if new_parent.is_system:
@@ -346,23 +348,18 @@ async def update_folder(
                 )
             # Check if new_parent is a descendant of folder
             check_parent = new_parent
-            while check_parent.parent_id:
+            while check_parent and check_parent.parent_id:
                 if check_parent.parent_id == folder_id:
                     raise ValidationError(
                         message="Cannot nest a folder into its own descendant",
                         code=ErrorCode.VALIDATION_FAILED,
                         param="parent_id",
                     )
-                result = await db.execute(
-                    select(Folder).where(Folder.id == check_parent.parent_id)
-                )
-                check_parent = result.scalar_one_or_none()
-                if not check_parent:
-                    break
+                check_parent = user_folders.get(check_parent.parent_id)
             # Calculate new depth
             new_depth = new_parent.depth + 1
             # Check max depth with children
-            max_child_depth = await get_folder_max_child_depth(db, folder_id)
+            max_child_depth = max((f.depth for f in _get_descendants(user_folders, folder_id)), default=0)
             child_depth_offset = max_child_depth - folder.depth if max_child_depth > 0 else 0
             if new_depth + child_depth_offset > 2:
                 raise ValidationError(
@@ -372,21 +369,19 @@ async def update_folder(
                 )
             update_data['depth'] = new_depth
             # Update children depths
-            await update_children_depth(db, folder_id, new_depth)
+            await _shift_descendant_depths(db, user_folders, folder_id, new_depth - folder.depth)
         else:
             # Moving to root level
             old_depth = folder.depth
             update_data['depth'] = 0
             # Update children depths
             depth_change = -old_depth
-            await update_children_depth(db, folder_id, 0)
+            await _shift_descendant_depths(db, user_folders, folder_id, depth_change)
 
     for field, value in update_data.items():
         setattr(folder, field, value)
 
-    folder.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(folder)
 
     # Get note count for response
     count_result = await db.execute(
@@ -423,10 +418,14 @@ async def reorder_folders(
     System folders cannot be reordered.
     """
     # Get all user's folders
-    result = await db.execute(
-        select(Folder).where(Folder.user_id == current_user.id)
-    )
-    user_folders = {f.id: f for f in result.scalars().all()}
+    user_folders = await _load_user_folders(db, current_user.id)
+
+    # Apply the moves to plain copies of the tree, then write every changed
+    # row in one bulk UPDATE instead of flushing folders one by one.
+    parent_by_id = {f.id: f.parent_id for f in user_folders.values()}
+    depth_by_id = {f.id: f.depth for f in user_folders.values()}
+    sort_order_by_id = {f.id: f.sort_order for f in user_folders.values()}
+    changed = set()
 
     # Validate and update each folder
     for item in reorder_data.folders:
@@ -458,7 +457,16 @@ async def reorder_folders(
                     code=ErrorCode.VALIDATION_FAILED,
                     param="parent_id",
                 )
-            new_depth = parent.depth + 1
+            ancestor_id = parent_by_id[item.parent_id]
+            while ancestor_id:
+                if ancestor_id == item.id:
+                    raise ValidationError(
+                        message="Cannot nest a folder into its own descendant",
+                        code=ErrorCode.VALIDATION_FAILED,
+                        param="parent_id",
+                    )
+                ancestor_id = parent_by_id.get(ancestor_id)
+            new_depth = depth_by_id[item.parent_id] + 1
             if new_depth > 2:
                 raise ValidationError(
                     message="Maximum folder nesting depth (2) exceeded",
@@ -467,15 +475,33 @@ async def reorder_folders(
                 )
 
         # Update folder
-        folder.sort_order = item.sort_order
-        if item.parent_id != folder.parent_id:
-            folder.parent_id = item.parent_id
-            folder.depth = new_depth
-            # Update children depths recursively
-            await update_children_depth(db, folder.id, new_depth)
-
-        folder.updated_at = datetime.utcnow()
-
+        if item.sort_order != sort_order_by_id[item.id]:
+            sort_order_by_id[item.id] = item.sort_order
+            changed.add(item.id)
+        if item.parent_id != parent_by_id[item.id]:
+            # Shift children depths along with the folder
+            depth_change = new_depth - depth_by_id[item.id]
+            for descendant_id in _descendant_ids(parent_by_id, item.id):
+                depth_by_id[descendant_id] += depth_change
+                changed.add(descendant_id)
+            parent_by_id[item.id] = item.parent_id
+            depth_by_id[item.id] = new_depth
+            changed.add(item.id)
+
+    if changed:
+        # ORM bulk UPDATE by primary key: a single executemany
+        await db.execute(
+            update(Folder),
+            [
+                {
+                    "id": folder_id,
+                    "sort_order": sort_order_by_id[folder_id],
+                    "parent_id": parent_by_id[folder_id],
+                    "depth": depth_by_id[folder_id],
+                }
+                for folder_id in changed
+            ],
+        )
     await db.commit()
 
     return {"message": "Folders reordered successfully"}
@@ -492,15 +518,7 @@ async def delete_folder(
     Delete a folder.
     Notes can be moved to another folder or will be unassigned.
     """
-    result = await db.execute(
-        select(Folder)
-        .where(Folder.id == folder_id)
-        .where(Folder.user_id == current_user.id)
-    )
-    folder = result.scalar_one_or_none()
-
-    if not folder:
-        raise NotFoundError(resource="folder", identifier=str(folder_id))
+    folder = await _get_user_folder(db, folder_id, current_user.id)
 
     if folder.is_system:
         raise ValidationError(
@@ -512,13 +530,7 @@ async def delete_folder(
     # Move notes to another folder or unassign
     if move_notes_to:
         # Verify target folder exists
-        result = await db.execute(
-            select(Folder)
-            .where(Folder.id == move_notes_to)
-            .where(Folder.user_id == current_user.id)
-        )
-        if not result.scalar_one_or_none():
-            raise NotFoundError(resource="folder", identifier=str(move_notes_to))
+        await _get_user_folder(db, move_notes_to, current_user.id)
 
     # Update notes - move to target folder or unassign
     await db.execute(
@@ -540,34 +552,25 @@ async def setup_default_folders(
     Create default folders for a new user.
     Called during onboarding. Always ensures "All Notes" exists.
     """
-    # Check if "All Notes" folder exists
+    # One query answers both "does All Notes exist" and "how many folders"
     result = await db.execute(
-        select(Folder)
-        .where(Folder.user_id == current_user.id)
-        .where(Folder.name == "All Notes")
+        select(Folder.name).where(Folder.user_id == current_user.id)
     )
-    all_notes_exists = result.scalar_one_or_none() is not None
+    existing_names = result.scalars().all()
+    all_notes_exists = "All Notes" in existing_names
+    count = len(existing_names)
 
-    # Check total folder count
-    count_result = await db.execute(
-        select(func.count(Folder.id))
-        .where(Folder.user_id == current_user.id)
-    )
-    count = count_result.scalar() or 0
-
-    created = 0
+    new_folders = []
 
     # Always ensure "All Notes" exists
     if not all_notes_exists:
-        all_notes = Folder(
+        new_folders.append(Folder(
             user_id=current_user.id,
             name="All Notes",
             icon="folder",
             is_system=True,
             sort_order=0,
-        )
-        db.add(all_notes)
-        created += 1
+        ))
 
     # Only create other defaults if no folders exist
     if count == 0 or (count == 1 and not all_notes_exists):
@@ -578,17 +581,21 @@ async def setup_default_folders(
         ]
 
         for folder_data in default_folders:
-            folder = Folder(
+            # The user's one folder may already be a default; names are unique per user
+            if folder_data["name"] in existing_names:
+                continue
+            new_folders.append(Folder(
                 user_id=current_user.id,
                 name=folder_data["name"],
                 icon=folder_data["icon"],
                 is_system=False,
                 sort_order=folder_data["sort_order"],
-            )
-            db.add(folder)
-            created += 1
+            ))
 
+    created = len(new_folders)
     if created > 0:
+        # Flushed as a single multi-row INSERT
+        db.add_all(new_folders)
         await db.commit()
 
     return {"message": f"Folders setup complete", "created": created}
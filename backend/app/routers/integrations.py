@@ -1,11 +1,16 @@
 """External integrations router (Google, Apple)."""
+import asyncio
 import logging
-from datetime import datetime
-from typing import Annotated
+import random
+from datetime import datetime, timedelta
+from typing import Annotated, Optional
 from urllib.parse import urlencode
+from uuid import UUID
+from weakref import WeakValueDictionary
 
+import httpx
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
@@ -14,7 +19,7 @@ from app.database import get_db
 from app.models.user import User
 from app.routers.auth import get_current_user
 from app.config import get_settings
-from app.utils import encrypt_token, decrypt_token
+from app.utils import encrypt_token, decrypt_token, create_oauth_state, verify_token
 from app.core.errors import NotFoundError, ValidationError, ExternalServiceError, ErrorCode
 from app.core.responses import MessageResponse
 from app.core.middleware import get_request_id
@@ -32,6 +37,129 @@ GOOGLE_SCOPES = [
 ]
 
 
+def get_google_http(request: Request) -> httpx.AsyncClient:
+    """Shared client for Google's OAuth endpoints, opened in the app lifespan."""
+    return request.app.state.google_http
+
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+# Token exchange retries: statuses worth retrying, attempts, and backoff cap.
+# An authorization code is single-use and Google may have redeemed it before
+# answering 5xx, so the code exchange only retries a rate limit.
+_GOOGLE_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_GOOGLE_CODE_RETRY_STATUSES = frozenset({429})
+# Transport errors raised before the request reached Google; safe to resend
+_GOOGLE_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_GOOGLE_TOKEN_ATTEMPTS = 4
+_GOOGLE_MAX_BACKOFF_SECONDS = 15.0
+
+# Caps in-flight token exchanges so a login burst can't trip Google's rate limits
+_google_oauth_semaphore = asyncio.Semaphore(20)
+
+
+def _google_retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After if given, else jittered exponential."""
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), _GOOGLE_MAX_BACKOFF_SECONDS)
+    backoff = 0.5 * 2 ** attempt
+    return min(backoff + random.uniform(0, backoff), _GOOGLE_MAX_BACKOFF_SECONDS)
+
+
+async def _post_google_token(google_http: httpx.AsyncClient, data: dict) -> httpx.Response:
+    """
+    POST to Google's token endpoint, retrying only when resending is safe.
+
+    Connection failures before a response are always retried. Refresh-token
+    grants also retry rate limits and transient 5xx; authorization-code
+    grants retry rate limits only.
+    """
+    if data.get("grant_type") == "authorization_code":
+        retry_statuses = _GOOGLE_CODE_RETRY_STATUSES
+    else:
+        retry_statuses = _GOOGLE_RETRY_STATUSES
+    last_attempt = _GOOGLE_TOKEN_ATTEMPTS - 1
+
+    async with _google_oauth_semaphore:
+        for attempt in range(_GOOGLE_TOKEN_ATTEMPTS):
+            try:
+                response = await google_http.post(GOOGLE_TOKEN_URL, data=data)
+            except _GOOGLE_UNSENT_ERRORS:
+                if attempt == last_attempt:
+                    raise
+                response = None
+            else:
+                if response.status_code not in retry_statuses or attempt == last_attempt:
+                    return response
+            await asyncio.sleep(_google_retry_delay(response, attempt))
+
+
+# Refresh a little early so a token doesn't expire mid-request
+_GOOGLE_EXPIRY_MARGIN = timedelta(seconds=60)
+
+# One lock per user, so concurrent requests share a single refresh. Held
+# weakly: an entry lives only while some request holds or waits on the lock.
+_google_refresh_locks: "WeakValueDictionary[UUID, asyncio.Lock]" = WeakValueDictionary()
+
+
+def _google_refresh_lock(user_id: UUID) -> asyncio.Lock:
+    lock = _google_refresh_locks.get(user_id)
+    if lock is None:
+        lock = _google_refresh_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+def _google_token_fresh(user: User) -> bool:
+    expiry = user.google_token_expiry
+    return expiry is not None and expiry > datetime.utcnow() + _GOOGLE_EXPIRY_MARGIN
+
+
+async def get_valid_google_access_token(
+    user: User, db: AsyncSession, google_http: httpx.AsyncClient
+) -> str:
+    """
+    Return a usable Google access token for the user, refreshing it if needed.
+
+    A fresh stored token is returned without locking. Otherwise the refresh
+    runs under a per-user lock and re-checks after acquiring it, so
+    concurrent requests trigger one refresh against Google and the others
+    pick up the token it persisted.
+
+    Raises:
+        ExternalServiceError: If Google rejects the refresh
+    """
+    if _google_token_fresh(user):
+        return decrypt_token(user.google_access_token)
+
+    async with _google_refresh_lock(user.id):
+        # Another request may have refreshed while we waited
+        await db.refresh(user, attribute_names=["google_access_token", "google_token_expiry"])
+        if _google_token_fresh(user):
+            return decrypt_token(user.google_access_token)
+
+        response = await _post_google_token(
+            google_http,
+            {
+                "refresh_token": decrypt_token(user.google_refresh_token),
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "grant_type": "refresh_token",
+            },
+        )
+        if response.status_code != 200:
+            raise ExternalServiceError(
+                service="google",
+                message="Failed to refresh Google access token",
+            )
+
+        tokens = response.json()
+        user.google_access_token = encrypt_token(tokens["access_token"])
+        user.google_token_expiry = datetime.utcnow() + timedelta(seconds=tokens.get("expires_in", 3600))
+        await db.commit()
+        return tokens["access_token"]
+
+
 @router.get("/status")
 async def get_integration_status(
     current_user: Annotated[User, Depends(get_current_user)],
@@ -74,7 +202,7 @@ async def google_connect(
         "scope": " ".join(GOOGLE_SCOPES),
         "access_type": "offline",
         "prompt": "consent",
-        "state": str(current_user.id),  # Pass user ID in state
+        "state": create_oauth_state(str(current_user.id)),  # Signed, short-lived user ID
     }
 
     auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
@@ -87,6 +215,7 @@ async def google_callback(
     code: str,
     state: str,
     db: AsyncSession = Depends(get_db),
+    google_http: httpx.AsyncClient = Depends(get_google_http),
 ):
     """
     Handle Google OAuth callback.
@@ -94,22 +223,30 @@ async def google_callback(
     """
     from google.oauth2 import id_token
     from google.auth.transport import requests as google_requests
-    import httpx
+
+    # The state must be one we signed for this flow; no DB lookup is needed
+    # to reject a forged or expired one.
+    state_payload = verify_token(state, token_type="oauth_state")
+    if not state_payload:
+        raise ValidationError(
+            message="Invalid or expired OAuth state",
+            code=ErrorCode.VALIDATION_INVALID_TOKEN,
+            param="state",
+        )
+    user_id = UUID(state_payload["sub"])
 
     try:
         # Exchange code for tokens
-        token_url = "https://oauth2.googleapis.com/token"
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
-                data={
-                    "code": code,
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "redirect_uri": settings.google_redirect_uri,
-                    "grant_type": "authorization_code",
-                },
-            )
+        response = await _post_google_token(
+            google_http,
+            {
+                "code": code,
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "redirect_uri": settings.google_redirect_uri,
+                "grant_type": "authorization_code",
+            },
+        )
 
         if response.status_code != 200:
             raise ExternalServiceError(
@@ -120,15 +257,10 @@ async def google_callback(
         tokens = response.json()
 
         # Get user from state
-        from sqlalchemy import select
-        from uuid import UUID
-        result = await db.execute(
-            select(User).where(User.id == UUID(state))
-        )
-        user = result.scalar_one_or_none()
+        user = await db.get(User, user_id)
 
         if not user:
-            raise NotFoundError(resource="user", identifier=state)
+            raise NotFoundError(resource="user", identifier=str(user_id))
 
         # Store tokens (encrypted)
         user.google_access_token = encrypt_token(tokens.get("access_token"))
@@ -136,7 +268,6 @@ async def google_callback(
 
         # Calculate expiry
         expires_in = tokens.get("expires_in", 3600)
-        from datetime import timedelta
         user.google_token_expiry = datetime.utcnow() + timedelta(seconds=expires_in)
 
         await db.commit()
@@ -181,15 +312,12 @@ async def apple_connect(
     """
     # Validate credentials by attempting connection
     try:
-        from app.services.apple_services import AppleCalendarService
+        from app.services.apple_services import AppleCalendarService, run_caldav
 
-        service = AppleCalendarService(
-            username=username,
-            app_password=app_password,
-        )
+        service = await run_caldav(AppleCalendarService, username, app_password)
 
         # Try to get calendars to verify connection
-        calendars = service.calendars
+        calendars = await run_caldav(lambda: service.calendars)
         if not calendars:
             raise ValueError("No calendars found")
 
@@ -229,6 +357,8 @@ async def disconnect_apple(
 @router.get("/google/test")
 async def test_google_connection(
     current_user: Annotated[User, Depends(get_current_user)],
+    db: AsyncSession = Depends(get_db),
+    google_http: httpx.AsyncClient = Depends(get_google_http),
 ):
     """Test Google connection by listing upcoming events."""
     if not current_user.google_access_token:
@@ -241,20 +371,22 @@ async def test_google_connection(
         from app.services.google_services import GoogleCalendarService
 
         service = GoogleCalendarService(
-            access_token=decrypt_token(current_user.google_access_token),
+            access_token=await get_valid_google_access_token(current_user, db, google_http),
             refresh_token=decrypt_token(current_user.google_refresh_token),
         )
 
         events = await service.list_events(max_results=5)
 
-        return {
+        # Return the response directly: these plain dicts need no
+        # jsonable_encoder pass before orjson serializes them.
+        return ORJSONResponse({
             "status": "connected",
             "upcoming_events": len(events),
             "events": [
                 {"summary": e.get("summary"), "start": e.get("start")}
                 for e in events
             ],
-        }
+        })
 
     except Exception as e:
         logger.exception(f"Google connection test failed: {e}")
@@ -276,19 +408,23 @@ async def test_apple_connection(
         )
 
     try:
-        from app.services.apple_services import AppleCalendarService
-
-        service = AppleCalendarService(
-            username=current_user.apple_caldav_username,
-            app_password=decrypt_token(current_user.apple_caldav_password),
+        from app.routers.actions import get_apple_calendar_service
+        from app.services.apple_services import run_caldav
+
+        # Reuse the user's cached CalDAV session, but list calendars afresh
+        service = await run_caldav(
+            get_apple_calendar_service,
+            current_user.id,
+            current_user.apple_caldav_username,
+            current_user.apple_caldav_password,
         )
 
-        calendars = service.calendars
+        calendars = await run_caldav(service.principal.calendars)
 
-        return {
+        return ORJSONResponse({
             "status": "connected",
             "calendars": [c.name for c in calendars],
-        }
+        })
 
     except Exception as e:
         logger.exception(f"Apple connection test failed: {e}")
@@ -1,20 +1,22 @@
 """Notes CRUD router."""
 import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Annotated, Optional, List
+from typing import Annotated, Dict, Optional, List, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, func, or_
+from sqlalchemy import Row, Select, and_, select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models.user import User
 from app.models.note import Note, Folder
-from app.models.action import ActionType
+from app.models.action import Action, ActionType
 from app.routers.auth import get_current_user
-from app.services.llm import LLMService
+from app.routers.folders import get_or_create_folder_id
+from app.services.llm import LLMService, get_llm_service
 from app.schemas.note_schemas import (
     NoteCreate,
     NoteUpdate,
@@ -30,25 +32,39 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shorter queries match nearly every note and can't use the trigram indexes
+MIN_SEARCH_QUERY_LENGTH = 2
+
+# List items need only these columns. Transcripts can run to megabytes, so only
+# enough of one to build the preview (and tell whether it was cut) is fetched.
+PREVIEW_LENGTH = 100
+_NOTE_LIST_COLUMNS = (
+    Note.id,
+    Note.title,
+    func.substr(Note.transcript, 1, PREVIEW_LENGTH + 1).label("preview_source"),
+    Note.duration,
+    Note.folder_id,
+    Note.tags,
+    Note.is_pinned,
+    Note.created_at,
+)
+
 
-def build_note_list_item(note: Note) -> NoteListItem:
+def build_note_list_item(note: Row, action_counts: Dict[ActionType, int]) -> NoteListItem:
     """
-    Build a NoteListItem from a Note object with eagerly-loaded actions.
+    Build a NoteListItem from a row of _NOTE_LIST_COLUMNS and its per-type action counts.
 
     Args:
-        note: A Note object with actions eagerly loaded via selectinload(Note.actions)
+        note: A row selected with _NOTE_LIST_COLUMNS
+        action_counts: Number of the note's actions per ActionType
 
     Returns:
         A NoteListItem with action counts and preview text populated
     """
-    # Count actions by type
-    calendar_count = sum(1 for a in note.actions if a.action_type == ActionType.CALENDAR)
-    email_count = sum(1 for a in note.actions if a.action_type == ActionType.EMAIL)
-    reminder_count = sum(1 for a in note.actions if a.action_type == ActionType.REMINDER)
-
-    # Handle preview: truncate transcript if needed, handle empty transcript
-    transcript = note.transcript or ""
-    preview = transcript[:100] + "..." if len(transcript) > 100 else transcript
+    # Handle preview: preview_source holds one character more than the
+    # preview, so a longer value means the transcript was truncated
+    transcript = note.preview_source or ""
+    preview = transcript[:PREVIEW_LENGTH] + "..." if len(transcript) > PREVIEW_LENGTH else transcript
 
     return NoteListItem(
         id=note.id,
@@ -58,14 +74,75 @@ def build_note_list_item(note: Note) -> NoteListItem:
         folder_id=note.folder_id,
         tags=note.tags or [],
         is_pinned=note.is_pinned,
-        action_count=len(note.actions),
-        calendar_count=calendar_count,
-        email_count=email_count,
-        reminder_count=reminder_count,
+        action_count=sum(action_counts.values()),
+        calendar_count=action_counts.get(ActionType.CALENDAR, 0),
+        email_count=action_counts.get(ActionType.EMAIL, 0),
+        reminder_count=action_counts.get(ActionType.REMINDER, 0),
         created_at=note.created_at,
     )
 
 
+async def build_note_list_items(db: AsyncSession, notes: List[Row]) -> List[NoteListItem]:
+    """
+    Build list items for a page of notes, counting their actions in SQL.
+
+    One grouped query over the page's note IDs replaces loading every action
+    row just to tally them.
+    """
+    counts: Dict[UUID, Dict[ActionType, int]] = defaultdict(dict)
+    if notes:
+        result = await db.execute(
+            select(Action.note_id, Action.action_type, func.count())
+            .where(Action.note_id.in_([note.id for note in notes]))
+            .group_by(Action.note_id, Action.action_type)
+        )
+        for note_id, action_type, count in result.all():
+            counts[note_id][action_type] = count
+
+    return [build_note_list_item(note, counts[note.id]) for note in notes]
+
+
+async def _fetch_note_page(
+    db: AsyncSession,
+    query: Select,
+    order_by: tuple,
+    page: int,
+    per_page: int,
+) -> Tuple[List[Row], int]:
+    """
+    Fetch one page of note list rows together with the total match count.
+
+    The total rides along as a window count on each row, so the filter is
+    evaluated once and the page costs a single round-trip.
+
+    Args:
+        db: Database session
+        query: A filtered select(*_NOTE_LIST_COLUMNS)
+        order_by: Ordering for the page
+        page: 1-based page number
+        per_page: Page size
+
+    Returns:
+        The page's rows and the total match count
+    """
+    result = await db.execute(
+        query
+        .add_columns(func.count().over().label("total"))
+        .order_by(*order_by)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    if rows:
+        return rows, rows[0].total
+    if page == 1:
+        return [], 0
+
+    # Past the last page there are no rows to carry the window count
+    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return [], count_result.scalar() or 0
+
+
 @router.get("", response_model=NoteListResponse)
 async def list_notes(
     current_user: Annotated[User, Depends(get_current_user)],
@@ -81,7 +158,7 @@ async def list_notes(
     """List all notes with filtering and pagination."""
     # Base query
     query = (
-        select(Note)
+        select(*_NOTE_LIST_COLUMNS)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == False)
     )
@@ -111,25 +188,13 @@ async def list_notes(
         # Default: don't show archived
         query = query.where(Note.is_archived == False)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    query = (
-        query
-        .options(selectinload(Note.actions))
-        .order_by(Note.is_pinned.desc(), Note.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+    # Fetch the page and the total count together
+    notes, total = await _fetch_note_page(
+        db, query, (Note.is_pinned.desc(), Note.created_at.desc()), page, per_page
     )
 
-    result = await db.execute(query)
-    notes = result.scalars().all()
-
     # Transform to list items using helper function
-    items = [build_note_list_item(note) for note in notes]
+    items = await build_note_list_items(db, notes)
 
     return NoteListResponse(
         items=items,
@@ -149,10 +214,13 @@ async def search_notes(
     per_page: int = Query(20, ge=1, le=100),
 ):
     """Full-text search notes."""
+    if len(q.strip()) < MIN_SEARCH_QUERY_LENGTH:
+        return NoteListResponse(items=[], total=0, page=page, per_page=per_page, pages=0)
+
     search_term = f"%{q}%"
 
     query = (
-        select(Note)
+        select(*_NOTE_LIST_COLUMNS)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == False)
         .where(
@@ -164,25 +232,13 @@ async def search_notes(
         )
     )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination
-    query = (
-        query
-        .options(selectinload(Note.actions))
-        .order_by(Note.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+    # Fetch the page and the total count together
+    notes, total = await _fetch_note_page(
+        db, query, (Note.created_at.desc(),), page, per_page
     )
 
-    result = await db.execute(query)
-    notes = result.scalars().all()
-
     # Transform to list items using helper function
-    items = [build_note_list_item(note) for note in notes]
+    items = await build_note_list_items(db, notes)
 
     return NoteListResponse(
         items=items,
@@ -200,29 +256,25 @@ async def unified_search(
     db: AsyncSession = Depends(get_db),
 ):
     """Search both folders and notes, returning combined results."""
+    if len(q.strip()) < MIN_SEARCH_QUERY_LENGTH:
+        return UnifiedSearchResponse(folders=[], notes=[])
+
     search_term = f"%{q}%"
 
-    # Search folders by name
+    # Search folders by name, counting each folder's notes in the same query
     folder_query = (
-        select(Folder)
+        select(Folder, func.count(Note.id))
+        .outerjoin(Note, and_(Note.folder_id == Folder.id, Note.is_deleted == False))
         .where(Folder.user_id == current_user.id)
         .where(Folder.name.ilike(search_term))
+        .group_by(Folder.id)
         .order_by(Folder.sort_order)
         .limit(10)
     )
     folder_result = await db.execute(folder_query)
-    folders = folder_result.scalars().all()
 
-    # Count notes per folder for the response
     folder_responses = []
-    for folder in folders:
-        note_count_query = select(func.count()).where(
-            Note.folder_id == folder.id,
-            Note.is_deleted == False
-        )
-        count_result = await db.execute(note_count_query)
-        note_count = count_result.scalar() or 0
-
+    for folder, note_count in folder_result.all():
         folder_responses.append(FolderResponse(
             id=folder.id,
             name=folder.name,
@@ -239,7 +291,7 @@ async def unified_search(
 
     # Search notes by title or transcript
     note_query = (
-        select(Note)
+        select(*_NOTE_LIST_COLUMNS)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == False)
         .where(Note.is_archived == False)
@@ -249,15 +301,14 @@ async def unified_search(
                 Note.transcript.ilike(search_term),
             )
         )
-        .options(selectinload(Note.actions))
         .order_by(Note.created_at.desc())
         .limit(20)
     )
     note_result = await db.execute(note_query)
-    notes = note_result.scalars().all()
+    notes = note_result.all()
 
     # Transform to list items using helper function
-    note_items = [build_note_list_item(note) for note in notes]
+    note_items = await build_note_list_items(db, notes)
 
     return UnifiedSearchResponse(
         folders=folder_responses,
@@ -279,31 +330,19 @@ async def list_all_notes(
     """
     # Base query - all non-deleted, non-archived notes for this user
     query = (
-        select(Note)
+        select(*_NOTE_LIST_COLUMNS)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == False)
         .where(Note.is_archived == False)
     )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    query = (
-        query
-        .options(selectinload(Note.actions))
-        .order_by(Note.is_pinned.desc(), Note.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+    # Fetch the page and the total count together
+    notes, total = await _fetch_note_page(
+        db, query, (Note.is_pinned.desc(), Note.created_at.desc()), page, per_page
     )
 
-    result = await db.execute(query)
-    notes = result.scalars().all()
-
     # Transform to list items using helper function
-    items = [build_note_list_item(note) for note in notes]
+    items = await build_note_list_items(db, notes)
 
     return NoteListResponse(
         items=items,
@@ -388,7 +427,6 @@ async def create_note(
         note.id = note_data.client_id
     db.add(note)
     await db.commit()
-    await db.refresh(note)
 
     # Return response without lazy-loading actions (new note has no actions)
     return NoteResponse(
@@ -418,9 +456,11 @@ async def update_note(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a note."""
+    # Load the relationships up front; the response is built from this
+    # instance after commit instead of re-fetching it.
     result = await db.execute(
         select(Note)
-        .options(selectinload(Note.actions))
+        .options(selectinload(Note.actions), selectinload(Note.folder))
         .where(Note.id == note_id)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == False)
@@ -430,6 +470,9 @@ async def update_note(
     if not note:
         raise NotFoundError(resource="note", identifier=str(note_id))
 
+    update_data = note_data.model_dump(exclude_unset=True)
+    folder = note.folder
+
     # Verify folder exists if changing
     if note_data.folder_id:
         result = await db.execute(
@@ -437,27 +480,20 @@ async def update_note(
             .where(Folder.id == note_data.folder_id)
             .where(Folder.user_id == current_user.id)
         )
-        if not result.scalar_one_or_none():
+        folder = result.scalar_one_or_none()
+        if not folder:
             raise NotFoundError(resource="folder", identifier=str(note_data.folder_id))
+    elif "folder_id" in update_data:
+        folder = None
 
-    update_data = note_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(note, field, value)
 
-    note.updated_at = datetime.utcnow()
     await db.commit()
 
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Note)
-        .options(selectinload(Note.actions), selectinload(Note.folder))
-        .where(Note.id == note.id)
-    )
-    note = result.scalar_one()
-
     response = NoteResponse.model_validate(note)
-    if note.folder:
-        response.folder_name = note.folder.name
+    if folder:
+        response.folder_name = folder.name
     return response
 
 
@@ -497,6 +533,7 @@ async def restore_note(
     """Restore a deleted note."""
     result = await db.execute(
         select(Note)
+        .options(selectinload(Note.actions), selectinload(Note.folder))
         .where(Note.id == note_id)
         .where(Note.user_id == current_user.id)
         .where(Note.is_deleted == True)
@@ -508,17 +545,8 @@ async def restore_note(
 
     note.is_deleted = False
     note.deleted_at = None
-    note.updated_at = datetime.utcnow()
     await db.commit()
 
-    # Re-fetch with relationships loaded
-    result = await db.execute(
-        select(Note)
-        .options(selectinload(Note.actions), selectinload(Note.folder))
-        .where(Note.id == note.id)
-    )
-    note = result.scalar_one()
-
     response = NoteResponse.model_validate(note)
     if note.folder:
         response.folder_name = note.folder.name
@@ -529,6 +557,7 @@ async def restore_note(
 async def auto_sort_note(
     note_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -563,54 +592,29 @@ async def auto_sort_note(
             user_folders = ['Work', 'Personal', 'Ideas']
 
         # Use LLM to suggest folder
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": datetime.utcnow().strftime("%Y-%m-%d"),
             "folders": user_folders,
         }
 
+        # End the read transaction so the LLM round-trip doesn't hold a pooled
+        # connection; the session checks one out again for the write below.
+        await db.commit()
+
         extraction = await llm_service.extract_actions(
             transcript=note.transcript or note.title,
             user_context=user_context,
         )
 
-        # Find or create the suggested folder
-        suggested_folder = extraction.folder
-        result = await db.execute(
-            select(Folder)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.name == suggested_folder)
-        )
-        folder = result.scalar_one_or_none()
-
-        if not folder:
-            # Create the folder if it doesn't exist
-            folder = Folder(
-                user_id=current_user.id,
-                name=suggested_folder,
-                icon="folder.fill",
-            )
-            db.add(folder)
-            await db.flush()
-
-        # Move the note to the suggested folder
-        note.folder_id = folder.id
-        note.updated_at = datetime.utcnow()
+        # Move the note to the suggested folder, creating it if needed
+        note.folder_id = await get_or_create_folder_id(db, current_user.id, extraction.folder)
 
         await db.commit()
 
-        # Re-fetch with folder relationship
-        result = await db.execute(
-            select(Note)
-            .options(selectinload(Note.actions), selectinload(Note.folder))
-            .where(Note.id == note.id)
-        )
-        note = result.scalar_one()
-
+        # Actions were loaded above and the folder's name is the one just upserted
         response = NoteResponse.model_validate(note)
-        if note.folder:
-            response.folder_name = note.folder.name
+        response.folder_name = extraction.folder
         return response
 
     except Exception as e:
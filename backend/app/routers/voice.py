@@ -1,7 +1,9 @@
 """Voice processing router - the core of Glide."""
+import asyncio
 import logging
 from datetime import datetime
-from typing import Annotated, Optional
+from io import BytesIO
+from typing import Annotated, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form
@@ -13,9 +15,10 @@ from app.models.user import User
 from app.models.note import Note, Folder
 from app.models.action import Action, ActionType, ActionStatus, ActionPriority
 from app.routers.auth import get_current_user
-from app.services.transcription import TranscriptionService
-from app.services.llm import LLMService
-from app.services.storage import StorageService
+from app.routers.folders import get_or_create_folder_id
+from app.services.transcription import TranscriptionService, get_transcription_service
+from app.services.llm import LLMService, get_llm_service
+from app.services.storage import StorageService, get_storage_service
 from app.schemas.voice_schemas import (
     VoiceProcessingResponse,
     ActionExtractionResult,
@@ -36,10 +39,40 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_ALLOWED_AUDIO_TYPES = frozenset(
+    {"audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"}
+)
+
+
+async def _read_upload(audio_file: UploadFile) -> bytes:
+    """
+    Read an upload once, off the event loop when Starlette spooled it to disk.
+
+    Callers wrap the bytes in BytesIO per consumer; BytesIO shares the
+    buffer instead of copying it, so upload and transcription don't each
+    hold their own copy of the audio.
+    """
+    await audio_file.seek(0)
+    return await audio_file.read()
+
+
+async def _user_folder_names(db: AsyncSession, user_id: UUID) -> List[str]:
+    """Names of the user's own folders, offered to the LLM for categorization."""
+    folders_result = await db.execute(
+        select(Folder.name)
+        .where(Folder.user_id == user_id)
+        .where(Folder.is_system == False)
+        .order_by(Folder.sort_order)
+    )
+    return [row[0] for row in folders_result.fetchall()] or ['Work', 'Personal', 'Ideas']
+
 
 @router.post("/process", response_model=VoiceProcessingResponse)
 async def process_voice_memo(
     current_user: Annotated[User, Depends(get_current_user)],
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    transcription_service: Annotated[TranscriptionService, Depends(get_transcription_service)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     audio_file: UploadFile = File(...),
     folder_id: Optional[UUID] = Form(None),
     db: AsyncSession = Depends(get_db),
@@ -53,8 +86,7 @@ async def process_voice_memo(
     5. Return structured response
     """
     # Validate file type
-    allowed_types = ["audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"]
-    if audio_file.content_type not in allowed_types:
+    if audio_file.content_type not in _ALLOWED_AUDIO_TYPES:
         raise ValidationError(
             message="Invalid audio format. Allowed: mp3, m4a, wav",
             code=ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT,
@@ -62,37 +94,26 @@ async def process_voice_memo(
         )
 
     try:
-        # 1. Upload audio to storage
-        storage_service = StorageService()
-        audio_file.file.seek(0)
-        upload_result = await storage_service.upload_audio(
-            file=audio_file.file,
-            user_id=str(current_user.id),
-            filename=audio_file.filename or "recording.mp3",
-            content_type=audio_file.content_type,
-        )
-
-        # 2. Transcribe audio
-        transcription_service = TranscriptionService()
-        audio_file.file.seek(0)
-        transcription = await transcription_service.transcribe(
-            audio_file=audio_file.file,
-            filename=audio_file.filename or "recording.mp3",
+        # 1-3. Upload, transcribe and fetch the user's folders concurrently;
+        # the folder query is the only one using the session meanwhile.
+        file_content = await _read_upload(audio_file)
+        filename = audio_file.filename or "recording.mp3"
+
+        upload_result, transcription, user_folders = await asyncio.gather(
+            storage_service.upload_audio(
+                file=BytesIO(file_content),
+                user_id=str(current_user.id),
+                filename=filename,
+                content_type=audio_file.content_type,
+            ),
+            transcription_service.transcribe(
+                audio_file=BytesIO(file_content),
+                filename=filename,
+            ),
+            _user_folder_names(db, current_user.id),
         )
 
-        # 3. Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
-
         # 4. Extract actions using LLM with user's folders
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": datetime.utcnow().strftime("%Y-%m-%d"),
@@ -116,25 +137,8 @@ async def process_voice_memo(
             if folder:
                 folder_name = folder.name
         else:
-            # Find or create folder based on AI suggestion
-            result = await db.execute(
-                select(Folder)
-                .where(Folder.user_id == current_user.id)
-                .where(Folder.name == extraction.folder)
-            )
-            folder = result.scalar_one_or_none()
-
-            if not folder:
-                # Create the folder
-                folder = Folder(
-                    user_id=current_user.id,
-                    name=extraction.folder,
-                    icon="folder.fill",
-                )
-                db.add(folder)
-                await db.flush()
-
-            folder_id = folder.id
+            # Find or create folder based on AI suggestion in one upsert
+            folder_id = await get_or_create_folder_id(db, current_user.id, extraction.folder)
 
         # 5. Create note
         note = Note(
@@ -170,7 +174,6 @@ async def process_voice_memo(
                 attendees=cal_action.attendees,
                 details={"original": cal_action.model_dump()},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Email drafts
@@ -185,7 +188,6 @@ async def process_voice_memo(
                 email_body=email_action.body,
                 details={"original": email_action.model_dump()},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Reminders
@@ -205,7 +207,6 @@ async def process_voice_memo(
                 scheduled_date=_parse_datetime(reminder.due_date, reminder.due_time),
                 details={"original": reminder.model_dump()},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Next steps
@@ -216,11 +217,10 @@ async def process_voice_memo(
                 status=ActionStatus.PENDING,
                 title=step,
             )
-            db.add(action)
             actions_created.append(action)
 
+        db.add_all(actions_created)
         await db.commit()
-        await db.refresh(note)
 
         # 7. Return response
         return VoiceProcessingResponse(
@@ -248,6 +248,9 @@ async def process_voice_memo(
 @router.post("/synthesize", response_model=SynthesisResponse)
 async def synthesize_note(
     current_user: Annotated[User, Depends(get_current_user)],
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    transcription_service: Annotated[TranscriptionService, Depends(get_transcription_service)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     db: AsyncSession = Depends(get_db),
     text_input: Optional[str] = Form(None),
     audio_file: Optional[UploadFile] = File(None),
@@ -269,8 +272,7 @@ async def synthesize_note(
         )
 
     # Validate audio file type if provided
-    allowed_types = ["audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"]
-    if audio_file and audio_file.content_type not in allowed_types:
+    if audio_file and audio_file.content_type not in _ALLOWED_AUDIO_TYPES:
         raise ValidationError(
             message="Invalid audio format. Allowed: mp3, m4a, wav",
             code=ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT,
@@ -286,18 +288,11 @@ async def synthesize_note(
 
         # Process audio if provided - run upload and transcription in parallel
         if audio_file:
-            import asyncio
-            from io import BytesIO
-
             # Read file content once for parallel operations
-            audio_file.file.seek(0)
-            file_content = audio_file.file.read()
+            file_content = await _read_upload(audio_file)
             filename = audio_file.filename or "recording.mp3"
             content_type = audio_file.content_type
 
-            storage_service = StorageService()
-            transcription_service = TranscriptionService()
-
             # Create async tasks for parallel execution
             async def upload_task():
                 return await storage_service.upload_audio(
@@ -313,10 +308,11 @@ async def synthesize_note(
                     filename=filename,
                 )
 
-            # Run both in parallel
-            upload_result, transcription = await asyncio.gather(
+            # Run both in parallel, alongside the folder query
+            upload_result, transcription, user_folders = await asyncio.gather(
                 upload_task(),
                 transcribe_task(),
+                _user_folder_names(db, current_user.id),
             )
 
             audio_key = upload_result.get("key")
@@ -342,19 +338,11 @@ async def synthesize_note(
                 "audio_key": None,
             })
 
-        # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
+        # Text-only input: fetch user's folders for smart categorization
+        if not audio_file:
+            user_folders = await _user_folder_names(db, current_user.id)
 
         # Synthesize content using LLM
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": now.strftime("%Y-%m-%d"),
@@ -378,23 +366,7 @@ async def synthesize_note(
             if folder:
                 folder_name = folder.name
         else:
-            result = await db.execute(
-                select(Folder)
-                .where(Folder.user_id == current_user.id)
-                .where(Folder.name == synthesis.get("folder", "Personal"))
-            )
-            folder = result.scalar_one_or_none()
-
-            if not folder:
-                folder = Folder(
-                    user_id=current_user.id,
-                    name=synthesis.get("folder", "Personal"),
-                    icon="folder.fill",
-                )
-                db.add(folder)
-                await db.flush()
-
-            folder_id = folder.id
+            folder_id = await get_or_create_folder_id(db, current_user.id, folder_name)
 
         # Create note with synthesized content
         note = Note(
@@ -435,7 +407,6 @@ async def synthesize_note(
                 attendees=cal_action.get("attendees", []),
                 details={"original": cal_action},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Email drafts
@@ -450,7 +421,6 @@ async def synthesize_note(
                 email_body=email_action.get("body"),
                 details={"original": email_action},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Reminders
@@ -470,7 +440,6 @@ async def synthesize_note(
                 scheduled_date=_parse_datetime(reminder.get("due_date", ""), reminder.get("due_time")),
                 details={"original": reminder},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Next steps
@@ -481,11 +450,10 @@ async def synthesize_note(
                 status=ActionStatus.PENDING,
                 title=step,
             )
-            db.add(action)
             actions_created.append(action)
 
+        db.add_all(actions_created)
         await db.commit()
-        await db.refresh(note)
 
         # Build response
         extraction = ActionExtractionResult(
@@ -542,6 +510,9 @@ async def synthesize_note(
 async def add_to_synthesis(
     note_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    transcription_service: Annotated[TranscriptionService, Depends(get_transcription_service)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     db: AsyncSession = Depends(get_db),
     text_input: Optional[str] = Form(None),
     audio_file: Optional[UploadFile] = File(None),
@@ -566,8 +537,7 @@ async def add_to_synthesis(
         )
 
     # Validate audio file type if provided
-    allowed_types = ["audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"]
-    if audio_file and audio_file.content_type not in allowed_types:
+    if audio_file and audio_file.content_type not in _ALLOWED_AUDIO_TYPES:
         raise ValidationError(
             message="Invalid audio format. Allowed: mp3, m4a, wav",
             code=ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT,
@@ -592,18 +562,11 @@ async def add_to_synthesis(
 
         # Process audio if provided - run upload and transcription in parallel
         if audio_file:
-            import asyncio
-            from io import BytesIO
-
             # Read file content once for parallel operations
-            audio_file.file.seek(0)
-            file_content = audio_file.file.read()
+            file_content = await _read_upload(audio_file)
             filename = audio_file.filename or "recording_add.mp3"
             content_type = audio_file.content_type
 
-            storage_service = StorageService()
-            transcription_service = TranscriptionService()
-
             # Create async tasks for parallel execution
             async def upload_task():
                 return await storage_service.upload_audio(
@@ -619,10 +582,11 @@ async def add_to_synthesis(
                     filename=filename,
                 )
 
-            # Run both in parallel
-            upload_result, transcription = await asyncio.gather(
+            # Run both in parallel, alongside the folder query
+            upload_result, transcription, user_folders = await asyncio.gather(
                 upload_task(),
                 transcribe_task(),
+                _user_folder_names(db, current_user.id),
             )
 
             audio_key = upload_result.get("key")
@@ -651,18 +615,10 @@ async def add_to_synthesis(
         ai_metadata["input_history"] = input_history
         ai_metadata["last_input_at"] = now.isoformat()
 
-        # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
+        # Text-only input: fetch user's folders for smart categorization
+        if not audio_file:
+            user_folders = await _user_folder_names(db, current_user.id)
 
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": now.strftime("%Y-%m-%d"),
@@ -685,7 +641,7 @@ async def add_to_synthesis(
             note.transcript = synthesis.get("narrative", note.transcript)
             note.title = synthesis.get("title", note.title)
             note.summary = synthesis.get("summary", note.summary)
-            note.tags = list(set(note.tags or []) | set(synthesis.get("tags", [])))[:10]
+            note.tags = _merge_tags(note.tags, synthesis.get("tags"))
             ai_metadata["synthesized_at"] = now.isoformat()
             new_actions = synthesis
             decision_info = {
@@ -709,7 +665,7 @@ async def add_to_synthesis(
                 note.transcript = synthesized_narrative
             # Preserve existing title — don't replace with synthesis title
             # Merge tags
-            note.tags = list(set(note.tags or []) | set(synthesis.get("tags", [])))[:10]
+            note.tags = _merge_tags(note.tags, synthesis.get("tags"))
             # Update summary
             new_summary = synthesis.get("summary")
             if note.summary and new_summary:
@@ -743,7 +699,7 @@ async def add_to_synthesis(
             note.transcript = synthesis.get("narrative", note.transcript)
             note.title = synthesis.get("title", note.title)
             note.summary = synthesis.get("summary", note.summary)
-            note.tags = list(set(note.tags or []) | set(synthesis.get("tags", [])))[:10]
+            note.tags = _merge_tags(note.tags, synthesis.get("tags"))
 
             if decision_info.get("update_type") == "resynthesize":
                 ai_metadata["synthesized_at"] = now.isoformat()
@@ -761,7 +717,7 @@ async def add_to_synthesis(
                 note.transcript = note.transcript + "\n\n" + synthesized_narrative
             else:
                 note.transcript = synthesized_narrative
-            note.tags = list(set(note.tags or []) | set(synthesis.get("tags", [])))[:10]
+            note.tags = _merge_tags(note.tags, synthesis.get("tags"))
             new_summary = synthesis.get("summary")
             if note.summary and new_summary:
                 note.summary = note.summary + "\n\n" + new_summary
@@ -784,6 +740,7 @@ async def add_to_synthesis(
         note.ai_metadata = ai_metadata
 
         # Create new actions if any
+        actions_created = []
         for cal_action in new_actions.get("calendar", []):
             action = Action(
                 note_id=note.id,
@@ -795,7 +752,7 @@ async def add_to_synthesis(
                 attendees=cal_action.get("attendees", []),
                 details={"original": cal_action, "added_at": now.isoformat()},
             )
-            db.add(action)
+            actions_created.append(action)
 
         for email_action in new_actions.get("email", []):
             action = Action(
@@ -808,7 +765,7 @@ async def add_to_synthesis(
                 email_body=email_action.get("body"),
                 details={"original": email_action, "added_at": now.isoformat()},
             )
-            db.add(action)
+            actions_created.append(action)
 
         for reminder in new_actions.get("reminders", []):
             priority = ActionPriority.MEDIUM
@@ -826,7 +783,7 @@ async def add_to_synthesis(
                 scheduled_date=_parse_datetime(reminder.get("due_date", ""), reminder.get("due_time")),
                 details={"original": reminder, "added_at": now.isoformat()},
             )
-            db.add(action)
+            actions_created.append(action)
 
         for step in new_actions.get("next_steps", []):
             action = Action(
@@ -836,10 +793,10 @@ async def add_to_synthesis(
                 title=step,
                 details={"added_at": now.isoformat()},
             )
-            db.add(action)
+            actions_created.append(action)
 
+        db.add_all(actions_created)
         await db.commit()
-        await db.refresh(note)
 
         # Get folder name
         folder_name = "Personal"
@@ -912,6 +869,7 @@ async def add_to_synthesis(
 async def resynthesize_note(
     note_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -946,17 +904,8 @@ async def resynthesize_note(
             }]
 
         # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
+        user_folders = await _user_folder_names(db, current_user.id)
 
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": now.strftime("%Y-%m-%d"),
@@ -982,7 +931,6 @@ async def resynthesize_note(
         note.ai_metadata = ai_metadata
 
         await db.commit()
-        await db.refresh(note)
 
         # Get folder name
         folder_name = "Personal"
@@ -1045,6 +993,7 @@ async def delete_input(
     note_id: UUID,
     input_index: int,
     current_user: Annotated[User, Depends(get_current_user)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -1093,18 +1042,9 @@ async def delete_input(
             note.duration = max(0, (note.duration or 0) - deleted_input.get("duration", 0))
 
         # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
+        user_folders = await _user_folder_names(db, current_user.id)
 
         # Re-synthesize from remaining inputs (comprehensive to preserve info)
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": now.strftime("%Y-%m-%d"),
@@ -1133,7 +1073,6 @@ async def delete_input(
         note.ai_metadata = ai_metadata
 
         await db.commit()
-        await db.refresh(note)
 
         # Get folder name
         folder_name = "Personal"
@@ -1197,6 +1136,9 @@ async def delete_input(
 async def append_to_note(
     note_id: UUID,
     current_user: Annotated[User, Depends(get_current_user)],
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
+    transcription_service: Annotated[TranscriptionService, Depends(get_transcription_service)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     audio_file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
 ):
@@ -1211,8 +1153,7 @@ async def append_to_note(
     7. Return updated note data
     """
     # Validate file type
-    allowed_types = ["audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"]
-    if audio_file.content_type not in allowed_types:
+    if audio_file.content_type not in _ALLOWED_AUDIO_TYPES:
         raise ValidationError(
             message="Invalid audio format. Allowed: mp3, m4a, wav",
             code=ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT,
@@ -1229,37 +1170,26 @@ async def append_to_note(
         raise NotFoundError(resource="note", identifier=str(note_id))
 
     try:
-        # 2. Upload audio to storage
-        storage_service = StorageService()
-        audio_file.file.seek(0)
-        upload_result = await storage_service.upload_audio(
-            file=audio_file.file,
-            user_id=str(current_user.id),
-            filename=audio_file.filename or "recording_append.mp3",
-            content_type=audio_file.content_type,
-        )
-
-        # 3. Transcribe new audio
-        transcription_service = TranscriptionService()
-        audio_file.file.seek(0)
-        transcription = await transcription_service.transcribe(
-            audio_file=audio_file.file,
-            filename=audio_file.filename or "recording_append.mp3",
-        )
-
-        # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
+        file_content = await _read_upload(audio_file)
+        filename = audio_file.filename or "recording_append.mp3"
+
+        # 2-3. Upload and transcribe the new audio while fetching the
+        # user's folders for smart categorization
+        upload_result, transcription, user_folders = await asyncio.gather(
+            storage_service.upload_audio(
+                file=BytesIO(file_content),
+                user_id=str(current_user.id),
+                filename=filename,
+                content_type=audio_file.content_type,
+            ),
+            transcription_service.transcribe(
+                audio_file=BytesIO(file_content),
+                filename=filename,
+            ),
+            _user_folder_names(db, current_user.id),
         )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
 
         # 4. Extract ONLY NEW actions using context-aware LLM method
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": datetime.utcnow().strftime("%Y-%m-%d"),
@@ -1282,9 +1212,7 @@ async def append_to_note(
         note.duration = (note.duration or 0) + transcription.duration
 
         # Add any new tags (merge with existing, avoid duplicates)
-        existing_tags = set(note.tags or [])
-        new_tags = set(extraction.tags or [])
-        note.tags = list(existing_tags | new_tags)[:10]  # Limit to 10 total tags
+        note.tags = _merge_tags(note.tags, extraction.tags)
 
         # Update ai_metadata to track append
         ai_metadata = note.ai_metadata or {}
@@ -1312,7 +1240,6 @@ async def append_to_note(
                 attendees=cal_action.attendees,
                 details={"original": cal_action.model_dump(), "from_append": True},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Email drafts
@@ -1327,7 +1254,6 @@ async def append_to_note(
                 email_body=email_action.body,
                 details={"original": email_action.model_dump(), "from_append": True},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Reminders
@@ -1347,7 +1273,6 @@ async def append_to_note(
                 scheduled_date=_parse_datetime(reminder.due_date, reminder.due_time),
                 details={"original": reminder.model_dump(), "from_append": True},
             )
-            db.add(action)
             actions_created.append(action)
 
         # Next steps
@@ -1359,11 +1284,10 @@ async def append_to_note(
                 title=step,
                 details={"from_append": True},
             )
-            db.add(action)
             actions_created.append(action)
 
+        db.add_all(actions_created)
         await db.commit()
-        await db.refresh(note)
 
         # Get folder name
         folder_name = "Personal"
@@ -1401,13 +1325,13 @@ async def append_to_note(
 @router.post("/transcribe")
 async def transcribe_only(
     current_user: Annotated[User, Depends(get_current_user)],
+    transcription_service: Annotated[TranscriptionService, Depends(get_transcription_service)],
     audio_file: UploadFile = File(...),
 ):
     """
     Transcribe audio without creating a note (for preview).
     """
-    allowed_types = ["audio/mpeg", "audio/mp3", "audio/m4a", "audio/wav", "audio/x-m4a", "audio/mp4"]
-    if audio_file.content_type not in allowed_types:
+    if audio_file.content_type not in _ALLOWED_AUDIO_TYPES:
         raise ValidationError(
             message="Invalid audio format. Allowed: mp3, m4a, wav",
             code=ErrorCode.VALIDATION_INVALID_AUDIO_FORMAT,
@@ -1415,10 +1339,8 @@ async def transcribe_only(
         )
 
     try:
-        transcription_service = TranscriptionService()
-        audio_file.file.seek(0)
         result = await transcription_service.transcribe(
-            audio_file=audio_file.file,
+            audio_file=BytesIO(await _read_upload(audio_file)),
             filename=audio_file.filename or "recording.mp3",
         )
 
@@ -1439,6 +1361,7 @@ async def transcribe_only(
 @router.post("/analyze")
 async def analyze_transcript(
     current_user: Annotated[User, Depends(get_current_user)],
+    llm_service: Annotated[LLMService, Depends(get_llm_service)],
     transcript: str = Form(...),
     db: AsyncSession = Depends(get_db),
 ):
@@ -1447,17 +1370,8 @@ async def analyze_transcript(
     """
     try:
         # Fetch user's folders for smart categorization
-        folders_result = await db.execute(
-            select(Folder.name)
-            .where(Folder.user_id == current_user.id)
-            .where(Folder.is_system == False)
-            .order_by(Folder.sort_order)
-        )
-        user_folders = [row[0] for row in folders_result.fetchall()]
-        if not user_folders:
-            user_folders = ['Work', 'Personal', 'Ideas']
+        user_folders = await _user_folder_names(db, current_user.id)
 
-        llm_service = LLMService()
         user_context = {
             "timezone": current_user.timezone,
             "current_date": datetime.utcnow().strftime("%Y-%m-%d"),
@@ -1482,6 +1396,7 @@ async def analyze_transcript(
 @router.get("/upload-url")
 async def get_upload_url(
     current_user: Annotated[User, Depends(get_current_user)],
+    storage_service: Annotated[StorageService, Depends(get_storage_service)],
     filename: str,
     content_type: str = "audio/mpeg",
 ):
@@ -1489,7 +1404,6 @@ async def get_upload_url(
     Get a presigned URL for direct upload from mobile app.
     """
     try:
-        storage_service = StorageService()
         result = await storage_service.get_upload_url(
             user_id=str(current_user.id),
             filename=filename,
@@ -1506,6 +1420,17 @@ async def get_upload_url(
         )
 
 
+def _merge_tags(existing: Optional[List[str]], new: Optional[List[str]], limit: int = 10) -> List[str]:
+    """Existing tags first, then unseen new ones, in order, up to the limit."""
+    merged: List[str] = []
+    for tag in (*(existing or ()), *(new or ())):
+        if len(merged) >= limit:
+            break
+        if tag not in merged:
+            merged.append(tag)
+    return merged
+
+
 def _parse_datetime(date_str: str, time_str: Optional[str] = None) -> datetime:
     """Parse date and optional time strings into datetime."""
     try:
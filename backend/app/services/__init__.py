@@ -1,9 +1,9 @@
 """Service layer for business logic."""
-from app.services.transcription import TranscriptionService
-from app.services.llm import LLMService
+from app.services.transcription import TranscriptionService, get_transcription_service
+from app.services.llm import LLMService, get_llm_service
 from app.services.google_services import GoogleCalendarService, GmailService
 from app.services.apple_services import AppleCalendarService, AppleRemindersService
-from app.services.storage import StorageService
+from app.services.storage import StorageService, get_storage_service
 
 __all__ = [
     "TranscriptionService",
@@ -13,4 +13,7 @@ __all__ = [
     "AppleCalendarService",
     "AppleRemindersService",
     "StorageService",
+    "get_transcription_service",
+    "get_llm_service",
+    "get_storage_service",
 ]
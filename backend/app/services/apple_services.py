@@ -1,12 +1,47 @@
 """Apple Calendar (CalDAV) and Reminders integration services."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Any, Callable, Optional, List, TypeVar
 import uuid
 
 import caldav
 from caldav.elements import dav, cdav
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import vobject
 
+ICLOUD_CALDAV_URL = "https://caldav.icloud.com"
+
+# caldav is synchronous (requests). Its calls run on a dedicated pool so a slow
+# iCloud round-trip neither blocks the event loop nor starves the default executor.
+_caldav_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="caldav")
+
+T = TypeVar("T")
+
+
+async def run_caldav(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking CalDAV call on the CalDAV thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_caldav_executor, func, *args)
+
+
+def _dav_client(username: str, app_password: str) -> caldav.DAVClient:
+    """CalDAV client whose requests session keeps a pool of connections to iCloud."""
+    client = caldav.DAVClient(
+        url=ICLOUD_CALDAV_URL,
+        username=username,
+        password=app_password
+    )
+    client.session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return client
+
 
 class AppleCalendarService:
     """Service for Apple Calendar via CalDAV."""
@@ -19,11 +54,7 @@ class AppleCalendarService:
             username: Apple ID email
             app_password: App-specific password (not regular Apple ID password)
         """
-        self.client = caldav.DAVClient(
-            url="https://caldav.icloud.com",
-            username=username,
-            password=app_password
-        )
+        self.client = _dav_client(username, app_password)
         self.principal = self.client.principal()
         self._calendars = None
 
@@ -58,10 +89,11 @@ class AppleCalendarService:
         if end_datetime is None:
             end_datetime = start_datetime + timedelta(hours=1)
 
-        # Find the right calendar
-        calendar = self.get_primary_calendar()
+        # Find the right calendar (the first call lists them over the network)
+        calendars = await run_caldav(lambda: self.calendars)
+        calendar = calendars[0] if calendars else None
         if calendar_name:
-            for cal in self.calendars:
+            for cal in calendars:
                 if cal.name == calendar_name:
                     calendar = cal
                     break
@@ -84,7 +116,7 @@ class AppleCalendarService:
             vevent.add('description').value = description
 
         # Save event
-        event = calendar.save_event(cal.serialize())
+        event = await run_caldav(calendar.save_event, cal.serialize())
 
         return {
             'uid': vevent.uid.value,
@@ -156,11 +188,7 @@ class AppleRemindersService:
             username: Apple ID email
             app_password: App-specific password
         """
-        self.client = caldav.DAVClient(
-            url="https://caldav.icloud.com",
-            username=username,
-            password=app_password
-        )
+        self.client = _dav_client(username, app_password)
         self.principal = self.client.principal()
 
     def get_reminder_lists(self) -> List:
@@ -192,7 +220,7 @@ class AppleRemindersService:
         Returns:
             dict with reminder uid
         """
-        lists = self.get_reminder_lists()
+        lists = await run_caldav(self.get_reminder_lists)
         reminder_list = lists[0] if lists else None
 
         if list_name:
@@ -220,7 +248,7 @@ class AppleRemindersService:
             vtodo.add('priority').value = str(priority)
 
         # Save reminder
-        todo = reminder_list.save_todo(cal.serialize())
+        todo = await run_caldav(reminder_list.save_todo, cal.serialize())
 
         return {
             'uid': vtodo.uid.value,
@@ -1,4 +1,4 @@
 """LLM service sub-package for AI-powered action extraction and synthesis."""
-from app.services.llm.service import LLMService
+from app.services.llm.service import LLMService, get_llm_service
 
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "get_llm_service"]
@@ -27,9 +27,19 @@ from app.services.llm.schema_builder import (
     build_user_context_string,
     build_messages,
 )
+from app.utils.result_cache import ResultCache, content_digest
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+EXTRACTION_CACHE_MAX_SIZE = 512
+
+# sha256(model, full prompt) -> ActionExtractionResult. Keying on the rendered
+# prompt covers the transcript, folders, timezone and date, and any prompt edit.
+_extraction_cache: ResultCache[ActionExtractionResult] = ResultCache(
+    ActionExtractionResult, EXTRACTION_CACHE_TTL_SECONDS, EXTRACTION_CACHE_MAX_SIZE
+)
+
 
 async def extract_actions(
     client,
@@ -65,6 +75,11 @@ async def extract_actions(
     context_str = build_user_context_string(user_context, folders_list)
     user_content = wrap_user_content(transcript) + "\n" + context_str
 
+    cache_key = content_digest(model, system_content, user_content)
+    cached = _extraction_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         response = client.chat.completions.create(
             model=model,
@@ -91,7 +106,7 @@ async def extract_actions(
 
     data = validate_llm_output(data, folders_list)
 
-    return ActionExtractionResult(
+    result = ActionExtractionResult(
         title=data.get("title", "Voice Note"),
         folder=data.get("folder", "Personal"),
         tags=data.get("tags", [])[:5],
@@ -105,6 +120,9 @@ async def extract_actions(
         reminders=data.get("reminders", []),
         next_steps=[],
     )
+    # Unparseable responses fall back above without caching, so a retry can succeed
+    _extraction_cache.set(cache_key, result)
+    return result
 
 
 async def extract_actions_for_append(
@@ -186,3 +186,15 @@ class LLMService:
         return await summarization.summarize_new_content(
             self.client, self.MODEL, new_transcript, existing_title, user_context
         )
+
+
+# Singleton instance
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """Get the shared LLMService, so its Groq client's connection pool is reused."""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
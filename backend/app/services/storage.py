@@ -5,6 +5,8 @@ import httpx
 from datetime import datetime
 from typing import BinaryIO
 
+from fastapi import Request
+
 from app.config import get_settings
 from app.core.errors import ExternalServiceError
 
@@ -12,7 +14,7 @@ from app.core.errors import ExternalServiceError
 class StorageService:
     """Service for file storage (Supabase Storage or local filesystem)."""
 
-    def __init__(self):
+    def __init__(self, http: httpx.AsyncClient):
         self.settings = get_settings()
         self.use_local = self.settings.use_local_storage
         self.local_path = self.settings.local_storage_path
@@ -22,6 +24,9 @@ class StorageService:
         self.service_role_key = self.settings.supabase_service_role_key
         self.bucket_name = "audio"
 
+        # Pooled client owned by the app lifespan, so connections stay warm
+        self.http = http
+
     def _generate_key(self, user_id: str, filename: str) -> str:
         """Generate a unique key for the file."""
         ext = os.path.splitext(filename)[1] or '.mp3'
@@ -78,25 +83,24 @@ class StorageService:
 
         file_content = file.read()
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    content=file_content,
-                    headers={
-                        "Authorization": f"Bearer {self.service_role_key}",
-                        "Content-Type": content_type,
-                        "x-upsert": "true",  # Overwrite if exists
-                    },
-                )
-            except httpx.HTTPError as e:
-                raise ExternalServiceError(service="storage", message=f"Failed to upload audio: {e}") from e
-
-            if response.status_code not in (200, 201):
-                raise ExternalServiceError(
-                    service="storage",
-                    message=f"Failed to upload audio (HTTP {response.status_code}): {response.text}",
-                )
+        try:
+            response = await self.http.post(
+                url,
+                content=file_content,
+                headers={
+                    "Authorization": f"Bearer {self.service_role_key}",
+                    "Content-Type": content_type,
+                    "x-upsert": "true",  # Overwrite if exists
+                },
+            )
+        except httpx.HTTPError as e:
+            raise ExternalServiceError(service="storage", message=f"Failed to upload audio: {e}") from e
+
+        if response.status_code not in (200, 201):
+            raise ExternalServiceError(
+                service="storage",
+                message=f"Failed to upload audio (HTTP {response.status_code}): {response.text}",
+            )
 
         # Generate public URL
         public_url = f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{key}"
@@ -125,27 +129,26 @@ class StorageService:
 
         url = f"{self.supabase_url}/storage/v1/object/sign/{self.bucket_name}/{key}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    json={"expiresIn": expires_in},
-                    headers={
-                        "Authorization": f"Bearer {self.service_role_key}",
-                        "Content-Type": "application/json",
-                    },
-                )
-            except httpx.HTTPError as e:
-                raise ExternalServiceError(service="storage", message=f"Failed to sign audio URL: {e}") from e
-
-            if response.status_code != 200:
-                raise ExternalServiceError(
-                    service="storage",
-                    message=f"Failed to generate signed URL (HTTP {response.status_code}): {response.text}",
-                )
-
-            data = response.json()
-            return f"{self.supabase_url}/storage/v1{data['signedURL']}"
+        try:
+            response = await self.http.post(
+                url,
+                json={"expiresIn": expires_in},
+                headers={
+                    "Authorization": f"Bearer {self.service_role_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+        except httpx.HTTPError as e:
+            raise ExternalServiceError(service="storage", message=f"Failed to sign audio URL: {e}") from e
+
+        if response.status_code != 200:
+            raise ExternalServiceError(
+                service="storage",
+                message=f"Failed to generate signed URL (HTTP {response.status_code}): {response.text}",
+            )
+
+        data = response.json()
+        return f"{self.supabase_url}/storage/v1{data['signedURL']}"
 
     async def get_public_url(self, key: str) -> str:
         """Get public URL for a file (bucket must be public or use signed URL)."""
@@ -171,17 +174,16 @@ class StorageService:
 
         url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{key}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.delete(
-                    url,
-                    headers={
-                        "Authorization": f"Bearer {self.service_role_key}",
-                    },
-                )
-            except httpx.HTTPError:
-                return False
-            return response.status_code in (200, 204, 404)
+        try:
+            response = await self.http.delete(
+                url,
+                headers={
+                    "Authorization": f"Bearer {self.service_role_key}",
+                },
+            )
+        except httpx.HTTPError:
+            return False
+        return response.status_code in (200, 204, 404)
 
     async def get_upload_url(
         self,
@@ -202,24 +204,28 @@ class StorageService:
         # For Supabase, we create a signed upload URL
         url = f"{self.supabase_url}/storage/v1/object/upload/sign/{self.bucket_name}/{key}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json={"expiresIn": expires_in},
-                headers={
-                    "Authorization": f"Bearer {self.service_role_key}",
-                    "Content-Type": "application/json",
-                }
-            )
+        response = await self.http.post(
+            url,
+            json={"expiresIn": expires_in},
+            headers={
+                "Authorization": f"Bearer {self.service_role_key}",
+                "Content-Type": "application/json",
+            }
+        )
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to generate upload URL: {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to generate upload URL: {response.text}")
 
-            data = response.json()
-            upload_url = f"{self.supabase_url}/storage/v1{data['url']}"
+        data = response.json()
+        upload_url = f"{self.supabase_url}/storage/v1{data['url']}"
 
-            return {
-                'upload_url': upload_url,
-                'key': key,
-                'token': data.get('token'),
-            }
+        return {
+            'upload_url': upload_url,
+            'key': key,
+            'token': data.get('token'),
+        }
+
+
+def get_storage_service(request: Request) -> StorageService:
+    """StorageService over the app's pooled HTTP client, opened in the lifespan."""
+    return StorageService(request.app.state.storage_http)
@@ -2,6 +2,7 @@
 from app.utils.auth import (
     create_access_token,
     create_refresh_token,
+    create_oauth_state,
     verify_password,
     get_password_hash,
     verify_token,
@@ -12,6 +13,7 @@ from app.utils.encryption import encrypt_token, decrypt_token, get_encryption_se
 __all__ = [
     "create_access_token",
     "create_refresh_token",
+    "create_oauth_state",
     "verify_password",
     "get_password_hash",
     "verify_token",
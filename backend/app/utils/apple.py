@@ -31,6 +31,9 @@ _apple_keys_cache: Dict[str, Any] = {}
 _cache_timestamp: float = 0
 CACHE_TTL_SECONDS = 3600  # 1 hour
 
+# Public keys constructed from the cached JWKS, by 'kid'; reset on refresh
+_constructed_keys: Dict[str, Any] = {}
+
 
 @dataclass
 class AppleTokenPayload:
@@ -78,6 +81,7 @@ async def get_apple_public_keys(force_refresh: bool = False) -> Dict[str, Any]:
         keys = await _fetch_apple_public_keys()
         _apple_keys_cache = keys
         _cache_timestamp = current_time
+        _constructed_keys.clear()
         logger.info("Refreshed Apple public keys from JWKS endpoint")
         return keys
     except Exception as e:
@@ -160,11 +164,14 @@ async def verify_apple_identity_token(
     # Find the correct key for this token
     key_data = _get_key_for_token(identity_token, jwks)
 
-    # Convert JWK to a format jose can use
-    try:
-        public_key = jwk.construct(key_data)
-    except JWKError as e:
-        raise JWTError(f"Failed to construct public key: {e}")
+    # Convert JWK to a format jose can use (once per key, not per request)
+    public_key = _constructed_keys.get(key_data["kid"])
+    if public_key is None:
+        try:
+            public_key = jwk.construct(key_data)
+        except JWKError as e:
+            raise JWTError(f"Failed to construct public key: {e}")
+        _constructed_keys[key_data["kid"]] = public_key
 
     # Verify and decode the token
     try:
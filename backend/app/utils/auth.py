@@ -1,6 +1,10 @@
 """Authentication utilities."""
+import asyncio
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Any
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -10,13 +14,38 @@ from app.config import get_settings
 settings = get_settings()
 
 # Password hashing
-# Prefer bcrypt_sha256 to avoid bcrypt's 72-byte password limit.
-# Keep bcrypt to verify legacy hashes.
-pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+# New hashes use Argon2id (argon2-cffi, OWASP m=19 MiB, t=2, p=1).
+# Keep bcrypt_sha256/bcrypt to verify legacy hashes.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+
+
+# Dedicated pool for password KDF work, sized to the CPUs that can run it, so a
+# burst of logins can't starve the loop's default executor.
+_kdf_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="kdf")
+
+T = TypeVar("T")
+
+
+async def run_kdf(func: Callable[..., T], *args: Any) -> T:
+    """Run a password hashing/verification call on the KDF thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_kdf_executor, func, *args)
+
+
+# Marks accounts that can't log in with a password (e.g. Apple Sign-In users)
+UNUSABLE_PASSWORD_PREFIX = "!"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
+    """Verify a password against a hash. CPU-bound: call via run_kdf from handlers."""
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except ValueError:
@@ -25,10 +54,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
+    """Hash a password. CPU-bound: call via run_kdf from handlers."""
     return pwd_context.hash(password)
 
 
+def make_unusable_password() -> str:
+    """Return a hashed_password value that never verifies, without running the KDF."""
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(32)
+
+
 def create_access_token(
     subject: str,
     expires_delta: Optional[timedelta] = None
@@ -99,6 +133,34 @@ def create_refresh_token(
     )
 
 
+def create_oauth_state(subject: str, expires_delta: timedelta = timedelta(minutes=10)) -> str:
+    """
+    Create a signed OAuth ``state`` value for a third-party consent flow.
+
+    Args:
+        subject: ID of the user starting the flow
+        expires_delta: How long the consent round-trip may take
+
+    Returns:
+        Encoded JWT carrying the user ID and a random nonce; check it with
+        verify_token(state, "oauth_state")
+    """
+    now = datetime.utcnow()
+    to_encode = {
+        "sub": str(subject),
+        "exp": now + expires_delta,
+        "type": "oauth_state",
+        "iat": now,
+        "nonce": secrets.token_urlsafe(16),
+    }
+
+    return jwt.encode(
+        to_encode,
+        settings.secret_key,
+        algorithm=settings.algorithm
+    )
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """
     Verify and decode a JWT token.
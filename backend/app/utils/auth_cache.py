@@ -0,0 +1,87 @@
+"""Short-lived cache of verified access tokens.
+
+Maps a token digest to the user ID it resolved to, so repeat requests with the
+same bearer token skip signature verification and the Supabase/legacy claim
+handling. The user row itself is still loaded per request (it must belong to
+the request's session), which also keeps ``is_active`` checks current.
+
+All operations are synchronous and run on the event loop thread, so no lock
+is needed.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# digest -> (user_id, expires_at); ordered oldest-first for LRU eviction
+_token_cache: "OrderedDict[bytes, Tuple[UUID, float]]" = OrderedDict()
+# user_id -> digests, so a user's entries can be dropped together
+_user_tokens: Dict[UUID, Set[bytes]] = {}
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _discard(digest: bytes) -> None:
+    entry = _token_cache.pop(digest, None)
+    if entry is not None:
+        digests = _user_tokens.get(entry[0])
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del _user_tokens[entry[0]]
+
+
+def get_cached_user_id(token: str) -> Optional[UUID]:
+    """Return the user ID for a previously verified token, if still fresh."""
+    digest = _digest(token)
+    entry = _token_cache.get(digest)
+    if entry is None:
+        return None
+
+    user_id, expires_at = entry
+    if time.time() >= expires_at:
+        _discard(digest)
+        return None
+
+    _token_cache.move_to_end(digest)
+    return user_id
+
+
+def cache_user_id(token: str, user_id: UUID, exp: Optional[float] = None) -> None:
+    """
+    Remember that a token verified successfully for a user.
+
+    Args:
+        token: The raw bearer token
+        user_id: ID of the user the token resolved to
+        exp: The token's own ``exp`` claim; the entry never outlives it
+    """
+    expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+    if exp is not None:
+        expires_at = min(expires_at, float(exp))
+
+    digest = _digest(token)
+    _discard(digest)
+    _token_cache[digest] = (user_id, expires_at)
+    _user_tokens.setdefault(user_id, set()).add(digest)
+
+    while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+        _discard(next(iter(_token_cache)))
+
+
+def invalidate_user_tokens(user_id: UUID) -> None:
+    """Drop every cached token for a user (password change, logout)."""
+    for digest in list(_user_tokens.get(user_id, ())):
+        _discard(digest)
+
+
+def clear_token_cache() -> None:
+    """Drop all cached tokens."""
+    _token_cache.clear()
+    _user_tokens.clear()
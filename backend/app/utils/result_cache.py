@@ -0,0 +1,79 @@
+"""Content-addressed cache for expensive AI results.
+
+Transcriptions and action extractions are pure functions of their inputs
+(audio bytes, transcript and user context), so a re-uploaded or retried memo
+can reuse an earlier result instead of paying for another Whisper or LLM call.
+Entries are keyed by a SHA-256 digest of those inputs and stored as JSON,
+so every hit hands back a fresh model the caller is free to mutate.
+
+The cache is per process and, like ``auth_cache``, only touched from the
+event loop thread, so no lock is needed.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def content_digest(*parts: object) -> str:
+    """SHA-256 hex digest over raw bytes, strings and JSON-serializable parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode()
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode()
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache(Generic[ModelT]):
+    """LRU cache of Pydantic results with a per-entry TTL."""
+
+    def __init__(self, model: Type[ModelT], ttl_seconds: float, max_size: int):
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        # key -> (json payload, expires_at); ordered oldest-first for LRU eviction
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[ModelT]:
+        """Return the cached result for a key, if present and still fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        payload, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+
+        try:
+            result = self.model.model_validate_json(payload)
+        except ValidationError:
+            # Stored under an older schema; drop it and recompute
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def set(self, key: str, result: ModelT) -> None:
+        """Store a result, evicting the least recently used entries if full."""
+        self._entries.pop(key, None)
+        self._entries[key] = (result.model_dump_json(), time.time() + self.ttl_seconds)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
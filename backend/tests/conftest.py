@@ -14,6 +14,8 @@ from app import main as app_main
 from app.database import Base, get_db
 from app.utils import auth as auth_utils
 from app.routers import auth as auth_router
+from app.services import transcription as transcription_service
+from app.services.llm import extraction as llm_extraction
 
 
 # Use SQLite for testing (async)
@@ -84,6 +86,24 @@ def client(test_db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def register_and_login(client):
+    """Return a helper that registers a user and logs in, giving auth headers."""
+    def _register_and_login(email: str, password: str = "testpassword123") -> dict:
+        client.post(
+            "/api/v1/auth/register",
+            json={"email": email, "password": password},
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": email, "password": password},
+        )
+        token = response.json().get("access_token")
+        return {"Authorization": f"Bearer {token}"}
+
+    return _register_and_login
+
+
 @pytest.fixture
 def auth_headers(client):
     """Create authenticated user and return headers."""
@@ -122,3 +142,11 @@ def mock_password_hashing(monkeypatch):
     monkeypatch.setattr(auth_utils, "verify_password", fake_verify, raising=False)
     monkeypatch.setattr(auth_router, "get_password_hash", fake_hash, raising=False)
     monkeypatch.setattr(auth_router, "verify_password", fake_verify, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def clear_result_caches():
+    """Keep cached transcriptions and extractions from leaking between tests."""
+    yield
+    transcription_service._transcription_cache.clear()
+    llm_extraction._extraction_cache.clear()
@@ -0,0 +1,198 @@
+"""Actions API tests."""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import httpx
+
+from app.main import app
+from app.models.action import Action, ActionPriority, ActionType
+from app.models.user import User
+from app.routers import actions
+from app.routers.actions import _gmail_service
+from app.routers.integrations import get_google_http
+from app.utils import decrypt_token, encrypt_token
+
+from tests.conftest import AsyncTestingSessionLocal
+
+
+def _create_note(client, headers: dict) -> str:
+    response = client.post(
+        "/api/v1/notes",
+        json={"title": "Action Note", "transcript": "Call Sam tomorrow"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _seed_action(note_id: str, **fields) -> str:
+    """Insert an action directly; there is no public create-action endpoint."""
+    async def _insert():
+        async with AsyncTestingSessionLocal() as session:
+            action = Action(
+                note_id=UUID(note_id),
+                action_type=fields.pop("action_type", ActionType.REMINDER),
+                priority=fields.pop("priority", ActionPriority.MEDIUM),
+                title=fields.pop("title", "Call Sam"),
+                attendees=[],
+                details={},
+                **fields,
+            )
+            session.add(action)
+            await session.commit()
+            return str(action.id)
+
+    return asyncio.run(_insert())
+
+
+def test_actions_crud_flow(client, register_and_login):
+    headers = register_and_login("actions-crud@example.com")
+    note_id = _create_note(client, headers)
+    action_id = _seed_action(note_id)
+
+    list_resp = client.get("/api/v1/actions", params={"note_id": note_id}, headers=headers)
+    assert list_resp.status_code == 200
+    assert [a["id"] for a in list_resp.json()] == [action_id]
+
+    get_resp = client.get(f"/api/v1/actions/{action_id}", headers=headers)
+    assert get_resp.status_code == 200
+    assert get_resp.json()["status"] == "pending"
+
+    update_resp = client.patch(
+        f"/api/v1/actions/{action_id}",
+        json={"title": "Call Sam back", "priority": "high"},
+        headers=headers,
+    )
+    assert update_resp.status_code == 200
+    assert update_resp.json()["title"] == "Call Sam back"
+    assert update_resp.json()["priority"] == "high"
+
+    complete_resp = client.post(f"/api/v1/actions/{action_id}/complete", headers=headers)
+    assert complete_resp.status_code == 200
+    assert complete_resp.json()["status"] == "executed"
+    assert complete_resp.json()["executed_at"] is not None
+
+    delete_resp = client.delete(f"/api/v1/actions/{action_id}", headers=headers)
+    assert delete_resp.status_code == 204
+
+    missing_resp = client.get(f"/api/v1/actions/{action_id}", headers=headers)
+    assert missing_resp.status_code == 404
+
+
+def test_actions_are_scoped_to_owner(client, register_and_login):
+    owner = register_and_login("actions-owner@example.com")
+    other = register_and_login("actions-other@example.com")
+    action_id = _seed_action(_create_note(client, owner))
+
+    assert client.get(f"/api/v1/actions/{action_id}", headers=other).status_code == 404
+    assert client.delete(f"/api/v1/actions/{action_id}", headers=other).status_code == 404
+    assert client.get("/api/v1/actions", headers=other).json() == []
+    assert client.get(f"/api/v1/actions/{action_id}", headers=owner).status_code == 200
+
+
+def test_execute_action_failures_mark_action_failed(client, register_and_login):
+    headers = register_and_login("actions-execute@example.com")
+    note_id = _create_note(client, headers)
+
+    # NEXT_STEP has no executor; CALENDAR fails because Google isn't connected.
+    for action_type in (ActionType.NEXT_STEP, ActionType.CALENDAR):
+        action_id = _seed_action(note_id, action_type=action_type)
+        response = client.post(
+            f"/api/v1/actions/{action_id}/execute",
+            json={"service": "google"},
+            headers=headers,
+        )
+        assert response.status_code == 502
+        assert client.get(f"/api/v1/actions/{action_id}", headers=headers).json()["status"] == "failed"
+
+
+def test_service_clients_cached_until_credentials_change():
+    user_id = uuid4()
+    token = encrypt_token("access-1")
+
+    service = _gmail_service(user_id, token)
+    assert _gmail_service(user_id, token) is service
+    assert service.creds.token == "access-1"
+    # No refresh token, so google-auth never rewrites a cached client's token
+    assert service.creds.refresh_token is None
+
+    rotated = _gmail_service(user_id, encrypt_token("access-2"))
+    assert rotated is not service
+    assert rotated.creds.token == "access-2"
+
+
+def test_note_list_items_count_actions_by_type(client, register_and_login):
+    headers = register_and_login("actions-counts@example.com")
+    note_id = _create_note(client, headers)
+    _create_note(client, headers)
+    for action_type in (ActionType.CALENDAR, ActionType.EMAIL, ActionType.EMAIL, ActionType.NEXT_STEP):
+        _seed_action(note_id, action_type=action_type)
+
+    items = {item["id"]: item for item in client.get("/api/v1/notes", headers=headers).json()["items"]}
+    assert len(items) == 2
+    counted = items[note_id]
+    assert (counted["action_count"], counted["calendar_count"], counted["email_count"], counted["reminder_count"]) == (4, 1, 2, 0)
+    other = next(item for item_id, item in items.items() if item_id != note_id)
+    assert other["action_count"] == 0
+
+
+def test_execute_google_action_refreshes_expired_token_first(client, monkeypatch, register_and_login):
+    headers = register_and_login("actions-google-refresh@example.com")
+    user_id = UUID(client.get("/api/v1/auth/me", headers=headers).json()["id"])
+    action_id = _seed_action(
+        _create_note(client, headers),
+        action_type=ActionType.CALENDAR,
+        scheduled_date=datetime(2026, 10, 20, 9, 0),
+    )
+
+    async def _expire_tokens():
+        async with AsyncTestingSessionLocal() as session:
+            user = await session.get(User, user_id)
+            user.google_access_token = encrypt_token("stale-access")
+            user.google_refresh_token = encrypt_token("refresh")
+            user.google_token_expiry = datetime.utcnow() - timedelta(minutes=5)
+            await session.commit()
+
+    asyncio.run(_expire_tokens())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert b"grant_type=refresh_token" in request.content
+        return httpx.Response(200, json={"access_token": "fresh-access", "expires_in": 3600})
+
+    google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[get_google_http] = lambda: google_http
+
+    used_tokens = []
+    threads = []
+
+    class FakeCalendarService:
+        def __init__(self, access_token, refresh_token=None):
+            used_tokens.append(access_token)
+            threads.append(threading.current_thread())
+
+        async def create_event(self, **kwargs):
+            threads.append(threading.current_thread())
+            return {"id": "evt-1", "html_link": "https://calendar.example/evt-1"}
+
+    monkeypatch.setattr(actions, "GoogleCalendarService", FakeCalendarService)
+    actions._google_calendar_service.cache_clear()
+
+    response = client.post(
+        f"/api/v1/actions/{action_id}/execute",
+        json={"service": "google"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert used_tokens == ["fresh-access"]
+    # Construction (Google discovery) ran off the event loop thread
+    constructed_on, loop_thread = threads
+    assert constructed_on is not loop_thread
+
+    async def _stored_token():
+        async with AsyncTestingSessionLocal() as session:
+            return decrypt_token((await session.get(User, user_id)).google_access_token)
+
+    assert asyncio.run(_stored_token()) == "fresh-access"
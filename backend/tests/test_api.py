@@ -1,4 +1,9 @@
 """API tests."""
+import re
+
+import pytest
+
+from app.core.errors import ERROR_CODE_STATUS_MAP, APIError, ErrorCode
 
 
 def test_root(client):
@@ -65,3 +70,31 @@ def test_integrations_status_no_auth(client):
     """Test integrations status requires auth."""
     response = client.get("/api/v1/integrations/status")
     assert response.status_code == 401
+
+
+@pytest.mark.parametrize("code", list(ErrorCode))
+def test_api_error_status_matches_map(code):
+    """Every error code carries the status published in ERROR_CODE_STATUS_MAP."""
+    assert APIError(code=code, message="x").status_code == ERROR_CODE_STATUS_MAP[code]
+
+
+def test_request_id_header(client):
+    """Incoming X-Request-ID is echoed back; otherwise a req_<16 hex> ID is generated."""
+    response = client.get("/", headers={"X-Request-ID": "req_client_supplied"})
+    assert response.headers["X-Request-ID"] == "req_client_supplied"
+    assert response.json()["request_id"] == "req_client_supplied"
+
+    response = client.get("/")
+    assert re.fullmatch(r"req_[0-9a-f]{16}", response.headers["X-Request-ID"])
+    assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+
+def test_validation_error_format(client):
+    """Request validation errors use the standard error envelope."""
+    response = client.post("/api/v1/auth/register", json={"email": "not-an-email"})
+    assert response.status_code == 422
+    error = response.json()["error"]
+    assert error["code"] == "validation_failed"
+    assert error["param"] == "email"
+    assert any(d.startswith("body -> email: ") for d in error["details"])
+    assert any(d.startswith("body -> password: ") for d in error["details"])
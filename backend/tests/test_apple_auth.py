@@ -0,0 +1,61 @@
+"""Apple identity token verification tests."""
+import asyncio
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.utils import apple
+
+
+def _signing_key_and_jwks(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = kid
+    return private_pem, {"keys": [public_jwk]}
+
+
+def test_verify_apple_identity_token_reuses_constructed_key(monkeypatch):
+    private_pem, jwks = _signing_key_and_jwks("test-kid")
+    monkeypatch.setattr(apple, "_apple_keys_cache", jwks)
+    monkeypatch.setattr(apple, "_cache_timestamp", time.time())
+    monkeypatch.setattr(apple, "_constructed_keys", {})
+
+    now = int(time.time())
+    token = jwt.encode(
+        {
+            "iss": apple.APPLE_ISSUER,
+            "aud": "com.example.glide",
+            "sub": "apple-user-1",
+            "email": "user@privaterelay.appleid.com",
+            "iat": now,
+            "exp": now + 600,
+        },
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": "test-kid"},
+    )
+
+    constructed = []
+    real_construct = apple.jwk.construct
+
+    def counting_construct(*args, **kwargs):
+        constructed.append(args)
+        return real_construct(*args, **kwargs)
+
+    monkeypatch.setattr(apple.jwk, "construct", counting_construct)
+
+    for _ in range(2):
+        payload = asyncio.run(apple.verify_apple_identity_token(token, bundle_id="com.example.glide"))
+        assert payload.user_id == "apple-user-1"
+    assert len(constructed) == 1
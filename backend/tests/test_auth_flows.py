@@ -1,4 +1,6 @@
 """Auth flow tests."""
+# Imported at collection time, before the autouse fixture stubs hashing out
+from app.utils.auth import make_unusable_password, verify_password
 
 
 def test_register_login_me_flow(client):
@@ -55,3 +57,52 @@ def test_login_invalid_password(client):
         data={"username": email, "password": "wrongpassword"},
     )
     assert login.status_code in [400, 401, 403]
+
+
+def test_verified_token_cached_until_logout(client, monkeypatch):
+    from app.routers import auth as auth_router
+
+    email = "auth-cache@example.com"
+    password = "testpassword123"
+    client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": password},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    # A cache hit must not re-verify the token
+    calls = []
+    real_verify_token = auth_router.verify_token
+
+    def counting_verify_token(*args, **kwargs):
+        calls.append(args)
+        return real_verify_token(*args, **kwargs)
+
+    monkeypatch.setattr(auth_router, "verify_token", counting_verify_token)
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert calls == []
+
+    # Logout drops the user's cached tokens, so the next request verifies again
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert len(calls) == 1
+
+
+def test_password_hashes_use_argon2id():
+    from app.utils.auth import pwd_context
+
+    hashed = pwd_context.hash("testpassword123")
+    assert hashed.startswith("$argon2id$v=19$m=19456,t=2,p=1$")
+    assert pwd_context.verify("testpassword123", hashed)
+    assert not pwd_context.verify("wrongpassword", hashed)
+    assert not pwd_context.needs_update(hashed)
+
+
+def test_unusable_password_never_verifies():
+    unusable = make_unusable_password()
+    assert unusable.startswith("!")
+    assert not verify_password(unusable, unusable)
+    assert not verify_password("", None)
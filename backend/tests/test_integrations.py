@@ -0,0 +1,278 @@
+"""Integrations API tests."""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import httpx
+
+from app.main import app
+from app.models.user import User
+from app.routers import actions, integrations
+from app.routers.integrations import get_google_http
+from app.services import apple_services
+from app.utils import create_oauth_state, decrypt_token, encrypt_token
+
+from tests.conftest import AsyncTestingSessionLocal
+
+
+def test_google_callback_exchanges_code_on_shared_client(client, register_and_login):
+    headers = register_and_login("google-callback@example.com")
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    token_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token_requests.append(request)
+        return httpx.Response(
+            200,
+            json={"access_token": "google-access", "refresh_token": "google-refresh", "expires_in": 3600},
+        )
+
+    google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[get_google_http] = lambda: google_http
+
+    response = client.get(
+        "/api/v1/integrations/google/callback",
+        params={"code": "auth-code", "state": create_oauth_state(user_id)},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 307
+    assert [str(r.url) for r in token_requests] == ["https://oauth2.googleapis.com/token"]
+    assert b"code=auth-code" in token_requests[0].content
+    assert client.get("/api/v1/integrations/status", headers=headers).json()["google"]["connected"] is True
+
+
+def test_google_callback_retries_rate_limited_token_exchange(client, monkeypatch, register_and_login):
+    headers = register_and_login("google-retry@example.com")
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    statuses = iter([429, 429])
+    delays = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses, 200)
+        if status != 200:
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"access_token": "google-access", "expires_in": 3600})
+
+    def record_delay(response, attempt):
+        delays.append(attempt)
+        return 0
+
+    monkeypatch.setattr(integrations, "_google_retry_delay", record_delay)
+    google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[get_google_http] = lambda: google_http
+
+    response = client.get(
+        "/api/v1/integrations/google/callback",
+        params={"code": "auth-code", "state": create_oauth_state(user_id)},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 307
+    assert delays == [0, 1]
+
+
+def test_google_code_exchange_does_not_retry_server_errors(client, monkeypatch, register_and_login):
+    headers = register_and_login("google-code-5xx@example.com")
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    responses = iter([
+        httpx.Response(503),
+        httpx.Response(400, json={"error": "invalid_grant"}),
+    ])
+    token_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token_requests.append(request)
+        return next(responses)
+
+    monkeypatch.setattr(integrations, "_google_retry_delay", lambda response, attempt: 0)
+    google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[get_google_http] = lambda: google_http
+
+    response = client.get(
+        "/api/v1/integrations/google/callback",
+        params={"code": "auth-code", "state": create_oauth_state(user_id)},
+        follow_redirects=False,
+    )
+
+    # Google may already have redeemed the code, so the 503 is not resent
+    assert response.status_code == 502
+    assert len(token_requests) == 1
+
+
+def test_google_token_post_retries_unsent_requests(monkeypatch):
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"access_token": "google-access"})
+
+    monkeypatch.setattr(integrations, "_google_retry_delay", lambda response, attempt: 0)
+
+    async def _post():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as google_http:
+            return await integrations._post_google_token(
+                google_http, {"code": "auth-code", "grant_type": "authorization_code"}
+            )
+
+    assert asyncio.run(_post()).status_code == 200
+    assert len(attempts) == 2
+
+
+def test_google_refresh_grant_retries_server_errors(monkeypatch):
+    statuses = iter([503, 502])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses, 200)
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, json={"access_token": "google-access"})
+
+    monkeypatch.setattr(integrations, "_google_retry_delay", lambda response, attempt: 0)
+
+    async def _post():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as google_http:
+            return await integrations._post_google_token(
+                google_http, {"refresh_token": "refresh", "grant_type": "refresh_token"}
+            )
+
+    assert asyncio.run(_post()).status_code == 200
+
+
+def test_google_retry_delay_honours_retry_after():
+    assert integrations._google_retry_delay(httpx.Response(429, headers={"Retry-After": "3"}), 0) == 3
+    assert integrations._google_retry_delay(httpx.Response(429, headers={"Retry-After": "120"}), 0) == 15
+    assert 1 <= integrations._google_retry_delay(httpx.Response(503), 1) <= 2
+
+
+def test_apple_connect_runs_caldav_off_the_event_loop(client, monkeypatch, register_and_login):
+    headers = register_and_login("apple-connect@example.com")
+    threads = []
+
+    class FakeCalendar:
+        name = "Home"
+
+    class FakeCalendarService:
+        def __init__(self, username, app_password):
+            threads.append(threading.current_thread().name)
+
+        @property
+        def calendars(self):
+            threads.append(threading.current_thread().name)
+            return [FakeCalendar()]
+
+    monkeypatch.setattr(apple_services, "AppleCalendarService", FakeCalendarService)
+
+    response = client.post(
+        "/api/v1/integrations/apple/connect",
+        params={"username": "me@icloud.com", "app_password": "abcd-efgh"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["calendars"] == ["Home"]
+    assert len(threads) == 2
+    assert all(name.startswith("caldav") for name in threads)
+
+
+def test_google_callback_rejects_unsigned_state(client, register_and_login):
+    headers = register_and_login("google-state@example.com")
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("token endpoint must not be called")
+
+    google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[get_google_http] = lambda: google_http
+
+    # A bare user ID (the old state format) is no longer accepted
+    response = client.get(
+        "/api/v1/integrations/google/callback",
+        params={"code": "auth-code", "state": user_id},
+        follow_redirects=False,
+    )
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "invalid_token"
+
+
+def test_apple_test_endpoint_lists_calendars(client, monkeypatch, register_and_login):
+    headers = register_and_login("apple-test@example.com")
+
+    class FakeCalendar:
+        def __init__(self, name):
+            self.name = name
+
+    class FakePrincipal:
+        def calendars(self):
+            return [FakeCalendar("Home"), FakeCalendar("Work")]
+
+    class FakeCalendarService:
+        def __init__(self, username, app_password):
+            self.principal = FakePrincipal()
+
+        @property
+        def calendars(self):
+            return self.principal.calendars()
+
+    monkeypatch.setattr(apple_services, "AppleCalendarService", FakeCalendarService)
+    client.post(
+        "/api/v1/integrations/apple/connect",
+        params={"username": "me@icloud.com", "app_password": "abcd-efgh"},
+        headers=headers,
+    )
+
+    monkeypatch.setattr(actions, "AppleCalendarService", FakeCalendarService)
+    actions.get_apple_calendar_service.cache_clear()
+
+    response = client.get("/api/v1/integrations/apple/test", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"status": "connected", "calendars": ["Home", "Work"]}
+
+
+def test_concurrent_google_token_refreshes_share_one_request(client, register_and_login):
+    headers = register_and_login("google-refresh@example.com")
+    user_id = UUID(client.get("/api/v1/auth/me", headers=headers).json()["id"])
+    refreshes = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        refreshes.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"access_token": "fresh-access", "expires_in": 3600})
+
+    async def _scenario():
+        async with AsyncTestingSessionLocal() as session:
+            user = await session.get(User, user_id)
+            user.google_access_token = encrypt_token("stale-access")
+            user.google_refresh_token = encrypt_token("refresh")
+            user.google_token_expiry = datetime.utcnow() - timedelta(minutes=5)
+            await session.commit()
+
+        google_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async def _get_token():
+            async with AsyncTestingSessionLocal() as session:
+                user = await session.get(User, user_id)
+                return await integrations.get_valid_google_access_token(user, session, google_http)
+
+        tokens = await asyncio.gather(_get_token(), _get_token())
+
+        async with AsyncTestingSessionLocal() as session:
+            stored = await session.get(User, user_id)
+            return tokens, decrypt_token(stored.google_access_token), stored.google_token_expiry
+
+    tokens, stored_token, expiry = asyncio.run(_scenario())
+
+    assert tokens == ["fresh-access", "fresh-access"]
+    assert len(refreshes) == 1
+    # Locks are only held while a refresh is in flight
+    assert len(integrations._google_refresh_locks) == 0
+    assert b"grant_type=refresh_token" in refreshes[0].content
+    assert stored_token == "fresh-access"
+    assert expiry > datetime.utcnow() + timedelta(minutes=30)
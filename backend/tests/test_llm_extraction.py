@@ -35,6 +35,37 @@ async def test_extract_actions_success():
     assert len(result.reminders) == 2
 
 
+@pytest.mark.asyncio
+async def test_extract_actions_caches_by_prompt():
+    calls = []
+
+    def respond(kwargs):
+        calls.append(kwargs)
+        return CANNED_EXTRACTION_RESPONSE
+
+    client = FakeGroqClient(respond)
+    first = await extract_actions(client, MODEL, TRANSCRIPT_MEETING, {"folders": ["Work"]})
+    first.title = "Edited by caller"
+    second = await extract_actions(client, MODEL, TRANSCRIPT_MEETING, {"folders": ["Work"]})
+    assert len(calls) == 1
+    assert second.title == "Product Sync with Engineering"
+
+    # A different user context renders a different prompt
+    await extract_actions(client, MODEL, TRANSCRIPT_MEETING, {"folders": ["Work", "Home"]})
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_actions_does_not_cache_unparseable_response():
+    responses = iter(["not json", CANNED_EXTRACTION_RESPONSE])
+    client = FakeGroqClient(lambda kwargs: next(responses))
+
+    fallback = await extract_actions(client, MODEL, TRANSCRIPT_MEETING)
+    assert fallback.title == "Voice Note"
+    retried = await extract_actions(client, MODEL, TRANSCRIPT_MEETING)
+    assert retried.title == "Product Sync with Engineering"
+
+
 @pytest.mark.asyncio
 async def test_extract_actions_with_context():
     response = json.dumps({
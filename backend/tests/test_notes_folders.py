@@ -1,22 +1,16 @@
 """Notes and folders API tests."""
-from uuid import uuid4
+import asyncio
+from uuid import UUID, uuid4
 
+from app.main import app
+from app.routers.folders import get_or_create_folder_id
+from app.services.llm import LLMService, get_llm_service
 
-def _register_and_login(client, email: str, password: str = "testpassword123") -> dict:
-    client.post(
-        "/api/v1/auth/register",
-        json={"email": email, "password": password},
-    )
-    response = client.post(
-        "/api/v1/auth/login",
-        data={"username": email, "password": password},
-    )
-    token = response.json().get("access_token")
-    return {"Authorization": f"Bearer {token}"}
+from tests.conftest import AsyncTestingSessionLocal
 
 
-def test_notes_crud_flow(client):
-    headers = _register_and_login(client, "notes-crud@example.com")
+def test_notes_crud_flow(client, register_and_login):
+    headers = register_and_login("notes-crud@example.com")
 
     # Create folder
     folder_resp = client.post(
@@ -65,8 +59,8 @@ def test_notes_crud_flow(client):
     assert restore_resp.json()["id"] == note_id
 
 
-def test_notes_all_endpoint(client):
-    headers = _register_and_login(client, "notes-all@example.com")
+def test_notes_all_endpoint(client, register_and_login):
+    headers = register_and_login("notes-all@example.com")
 
     for idx in range(2):
         resp = client.post(
@@ -84,8 +78,40 @@ def test_notes_all_endpoint(client):
     assert len(all_resp.json()["items"]) >= 2
 
 
-def test_folders_crud_flow(client):
-    headers = _register_and_login(client, "folders-crud@example.com")
+def test_note_pages_report_total(client, register_and_login):
+    headers = register_and_login("notes-pages@example.com")
+
+    for idx in range(3):
+        client.post(
+            "/api/v1/notes",
+            json={"title": f"Paged {idx}", "transcript": "Body"},
+            headers=headers,
+        )
+
+    for path in ("/api/v1/notes", "/api/v1/notes/all"):
+        pages = [
+            client.get(path, params={"page": page, "per_page": 2}, headers=headers).json()
+            for page in (1, 2, 5)
+        ]
+        assert [len(p["items"]) for p in pages] == [2, 1, 0]
+        assert {p["total"] for p in pages} == {3}
+        assert {p["pages"] for p in pages} == {2}
+
+
+def test_note_list_previews_truncate_long_transcripts(client, register_and_login):
+    headers = register_and_login("notes-preview@example.com")
+    for title, transcript in (("Long", "x" * 250), ("Exact", "y" * 100)):
+        client.post("/api/v1/notes", json={"title": title, "transcript": transcript}, headers=headers)
+
+    previews = {
+        item["title"]: item["preview"]
+        for item in client.get("/api/v1/notes", headers=headers).json()["items"]
+    }
+    assert previews == {"Long": "x" * 100 + "...", "Exact": "y" * 100}
+
+
+def test_folders_crud_flow(client, register_and_login):
+    headers = register_and_login("folders-crud@example.com")
 
     # Create folder
     folder_resp = client.post(
@@ -123,8 +149,8 @@ def test_folders_crud_flow(client):
     assert delete_resp.status_code == 204
 
 
-def test_folder_delete_moves_notes(client):
-    headers = _register_and_login(client, "folders-move@example.com")
+def test_folder_delete_moves_notes(client, register_and_login):
+    headers = register_and_login("folders-move@example.com")
 
     folder_a = client.post(
         "/api/v1/folders",
@@ -158,8 +184,8 @@ def test_folder_delete_moves_notes(client):
     assert note_resp.json()["folder_id"] == folder_b
 
 
-def test_notes_folder_not_found_on_create(client):
-    headers = _register_and_login(client, "notes-folder-missing@example.com")
+def test_notes_folder_not_found_on_create(client, register_and_login):
+    headers = register_and_login("notes-folder-missing@example.com")
     missing_id = str(uuid4())
 
     resp = client.post(
@@ -172,3 +198,206 @@ def test_notes_folder_not_found_on_create(client):
         headers=headers,
     )
     assert resp.status_code == 404
+
+
+def test_folder_nesting_updates_descendant_depths(client, register_and_login):
+    headers = register_and_login("folders-nesting@example.com")
+
+    def create(name, parent_id=None):
+        return client.post(
+            "/api/v1/folders",
+            json={"name": name, "parent_id": parent_id},
+            headers=headers,
+        ).json()["id"]
+
+    def depths():
+        pending = client.get("/api/v1/folders", headers=headers).json()
+        found = {}
+        while pending:
+            item = pending.pop()
+            found[item["id"]] = item["depth"]
+            pending.extend(item["children"])
+        return found
+
+    parent = create("Parent")
+    child = create("Child", parent)
+    target = create("Target")
+
+    # Moving the parent under target shifts the whole subtree down one level
+    move_resp = client.patch(
+        f"/api/v1/folders/{parent}", json={"parent_id": target}, headers=headers
+    )
+    assert move_resp.status_code == 200
+    assert depths()[parent] == 1
+    assert depths()[child] == 2
+
+    # target is now an ancestor of child, so nesting it there would be circular
+    circular_resp = client.patch(
+        f"/api/v1/folders/{target}", json={"parent_id": child}, headers=headers
+    )
+    assert circular_resp.status_code == 400
+
+    root_resp = client.patch(
+        f"/api/v1/folders/{parent}", json={"parent_id": None}, headers=headers
+    )
+    assert root_resp.status_code == 200
+    assert depths()[parent] == 0
+    assert depths()[child] == 1
+
+    # Reordering the parent under target shifts its child too
+    reorder_resp = client.post(
+        "/api/v1/folders/reorder",
+        json={"folders": [{"id": parent, "sort_order": 0, "parent_id": target}]},
+        headers=headers,
+    )
+    assert reorder_resp.status_code == 200
+    assert depths()[parent] == 1
+    assert depths()[child] == 2
+
+    circular_reorder = client.post(
+        "/api/v1/folders/reorder",
+        json={"folders": [{"id": target, "sort_order": 0, "parent_id": child}]},
+        headers=headers,
+    )
+    assert circular_reorder.status_code == 400
+
+
+def test_all_notes_folder_counts_every_note(client, register_and_login):
+    headers = register_and_login("folders-all-notes@example.com")
+    assert client.post("/api/v1/folders/setup-defaults", headers=headers).status_code == 200
+
+    folder_id = client.post(
+        "/api/v1/folders", json={"name": "Filed"}, headers=headers
+    ).json()["id"]
+    client.post(
+        "/api/v1/notes",
+        json={"title": "Filed note", "transcript": "Text", "folder_id": folder_id},
+        headers=headers,
+    )
+    client.post(
+        "/api/v1/notes",
+        json={"title": "Unfiled note", "transcript": "Text"},
+        headers=headers,
+    )
+
+    folders = {f["name"]: f for f in client.get("/api/v1/folders", headers=headers).json()}
+    assert folders["Filed"]["note_count"] == 1
+    assert folders["All Notes"]["note_count"] == 2
+
+
+def test_unified_search_counts_notes_per_folder(client, register_and_login):
+    headers = register_and_login("unified-search@example.com")
+
+    folder_ids = {}
+    for name in ("Projects Alpha", "Projects Beta"):
+        resp = client.post("/api/v1/folders", json={"name": name}, headers=headers)
+        assert resp.status_code == 201
+        folder_ids[name] = resp.json()["id"]
+
+    for title in ("Kickoff", "Retro"):
+        client.post(
+            "/api/v1/notes",
+            json={"title": title, "transcript": "alpha work", "folder_id": folder_ids["Projects Alpha"]},
+            headers=headers,
+        )
+    deleted = client.post(
+        "/api/v1/notes",
+        json={"title": "Gone", "transcript": "alpha work", "folder_id": folder_ids["Projects Alpha"]},
+        headers=headers,
+    ).json()["id"]
+    client.delete(f"/api/v1/notes/{deleted}", headers=headers)
+
+    response = client.get("/api/v1/notes/search/all", params={"q": "projects"}, headers=headers)
+    assert response.status_code == 200
+    counts = {f["name"]: f["note_count"] for f in response.json()["folders"]}
+    assert counts == {"Projects Alpha": 2, "Projects Beta": 0}
+
+
+def test_search_ignores_too_short_queries(client, register_and_login):
+    headers = register_and_login("short-search@example.com")
+    client.post("/api/v1/folders", json={"name": "a folder"}, headers=headers)
+    client.post("/api/v1/notes", json={"title": "a note", "transcript": "a"}, headers=headers)
+
+    unified = client.get("/api/v1/notes/search/all", params={"q": " a "}, headers=headers)
+    assert unified.json() == {"folders": [], "notes": []}
+
+    paged = client.get("/api/v1/notes/search", params={"q": "a"}, headers=headers)
+    assert paged.status_code == 200
+    assert paged.json()["items"] == []
+    assert paged.json()["total"] == 0
+
+
+def test_get_or_create_folder_id_upserts_by_name(client, register_and_login):
+    headers = register_and_login("folder-upsert@example.com")
+    user_id = UUID(client.get("/api/v1/auth/me", headers=headers).json()["id"])
+    existing = client.post("/api/v1/folders", json={"name": "Travel"}, headers=headers).json()["id"]
+
+    async def _upsert(name):
+        async with AsyncTestingSessionLocal() as session:
+            folder_id = await get_or_create_folder_id(session, user_id, name)
+            await session.commit()
+            return folder_id
+
+    assert str(asyncio.run(_upsert("Travel"))) == existing
+    created = asyncio.run(_upsert("Receipts"))
+    assert asyncio.run(_upsert("Receipts")) == created
+
+    names = [f["name"] for f in client.get("/api/v1/folders", headers=headers).json()]
+    assert names.count("Travel") == 1
+    assert names.count("Receipts") == 1
+
+
+def test_note_writes_report_current_folder(client, register_and_login):
+    headers = register_and_login("note-writes@example.com")
+    folder_id = client.post("/api/v1/folders", json={"name": "Inbox Zero"}, headers=headers).json()["id"]
+    note_id = client.post(
+        "/api/v1/notes", json={"title": "Filed", "transcript": "Body"}, headers=headers
+    ).json()["id"]
+
+    moved = client.patch(f"/api/v1/notes/{note_id}", json={"folder_id": folder_id}, headers=headers)
+    assert moved.status_code == 200
+    assert moved.json()["folder_id"] == folder_id
+    assert moved.json()["folder_name"] == "Inbox Zero"
+
+    renamed = client.patch(f"/api/v1/notes/{note_id}", json={"title": "Filed away"}, headers=headers)
+    assert renamed.json()["folder_name"] == "Inbox Zero"
+
+    client.delete(f"/api/v1/notes/{note_id}", headers=headers)
+    restored = client.post(f"/api/v1/notes/{note_id}/restore", headers=headers)
+    assert restored.status_code == 200
+    assert restored.json()["title"] == "Filed away"
+    assert restored.json()["folder_name"] == "Inbox Zero"
+
+    unfiled = client.patch(f"/api/v1/notes/{note_id}", json={"folder_id": None}, headers=headers)
+    assert unfiled.json()["folder_id"] is None
+    assert unfiled.json()["folder_name"] is None
+
+
+def test_auto_sort_uses_shared_llm_service(client, register_and_login):
+    headers = register_and_login("auto-sort@example.com")
+    note_id = client.post(
+        "/api/v1/notes", json={"title": "Groceries", "transcript": "Buy milk"}, headers=headers
+    ).json()["id"]
+
+    # No Groq client: extraction falls back to the mock, which files under "Personal"
+    llm_service = LLMService.__new__(LLMService)
+    llm_service.client = None
+    app.dependency_overrides[get_llm_service] = lambda: llm_service
+
+    response = client.post(f"/api/v1/notes/{note_id}/auto-sort", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["folder_name"] == "Personal"
+    folders = {f["name"]: f["id"] for f in client.get("/api/v1/folders", headers=headers).json()}
+    assert response.json()["folder_id"] == folders["Personal"]
+
+
+def test_setup_defaults_skips_existing_default_name(client, register_and_login):
+    headers = register_and_login("folders-setup@example.com")
+    client.post("/api/v1/folders", json={"name": "Work"}, headers=headers)
+
+    response = client.post("/api/v1/folders/setup-defaults", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+    names = sorted(f["name"] for f in client.get("/api/v1/folders", headers=headers).json())
+    assert names == ["All Notes", "Ideas", "Personal", "Work"]
@@ -0,0 +1,118 @@
+"""Voice processing API tests."""
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app import main as app_main
+from app.main import app
+from app.routers.voice import _merge_tags
+from app.schemas.voice_schemas import ActionExtractionResult, TranscriptionResult
+from app.services import TranscriptionService, get_llm_service, get_storage_service, get_transcription_service
+
+from tests.llm_helpers import CANNED_EXTRACTION_RESPONSE, TRANSCRIPT_MEETING
+
+
+class FakeStorageService:
+    uploaded = None
+
+    async def upload_audio(self, file, user_id, filename, content_type="audio/mpeg"):
+        # Only completes once transcription is running alongside it
+        await asyncio.wait_for(FakeTranscriptionService.started.wait(), timeout=1)
+        FakeStorageService.uploaded = file.read()
+        return {"key": f"{user_id}/{filename}", "url": "file://test", "bucket": "local"}
+
+
+class FakeTranscriptionService:
+    started = None
+
+    async def transcribe(self, audio_file, filename):
+        FakeTranscriptionService.started.set()
+        assert audio_file.read() == b"fake-audio"
+        return TranscriptionResult(text=TRANSCRIPT_MEETING, language="en", duration=42)
+
+
+class FakeLLMService:
+    folders = None
+
+    async def extract_actions(self, transcript, user_context=None, **kwargs):
+        FakeLLMService.folders = user_context["folders"]
+        return ActionExtractionResult.model_validate_json(CANNED_EXTRACTION_RESPONSE)
+
+
+def test_process_voice_memo_overlaps_upload_and_transcription(client, register_and_login):
+    headers = register_and_login("voice-process@example.com")
+    FakeTranscriptionService.started = asyncio.Event()
+    app.dependency_overrides[get_storage_service] = FakeStorageService
+    app.dependency_overrides[get_transcription_service] = FakeTranscriptionService
+    app.dependency_overrides[get_llm_service] = FakeLLMService
+
+    response = client.post(
+        "/api/v1/voice/process",
+        files={"audio_file": ("memo.mp3", b"fake-audio", "audio/mpeg")},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["title"] == "Product Sync with Engineering"
+    assert data["folder_name"] == "Meetings"
+    assert data["duration"] == 42
+    assert FakeStorageService.uploaded == b"fake-audio"
+    assert FakeLLMService.folders
+
+    note = client.get(f"/api/v1/notes/{data['note_id']}", headers=headers).json()
+    assert note["audio_url"].endswith("memo.mp3")
+    assert len(note["actions"]) == 3
+
+    # The suggested folder now exists, so a second memo reuses it
+    again = client.post(
+        "/api/v1/voice/process",
+        files={"audio_file": ("memo.mp3", b"fake-audio", "audio/mpeg")},
+        headers=headers,
+    )
+    assert again.status_code == 200
+    assert again.json()["folder_id"] == data["folder_id"]
+
+
+def test_transcription_reuses_result_for_identical_audio():
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["file"].read())
+        return SimpleNamespace(text="Buy milk", language="en")
+
+    service = TranscriptionService()
+    service.groq_client = SimpleNamespace(
+        audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create))
+    )
+
+    async def _transcribe(data: bytes):
+        return await service.transcribe(audio_file=BytesIO(data), filename="memo.m4a")
+
+    first = asyncio.run(_transcribe(b"same-audio"))
+    second = asyncio.run(_transcribe(b"same-audio"))
+    asyncio.run(_transcribe(b"other-audio"))
+
+    assert first == second
+    assert second.text == "Buy milk"
+    assert calls == [b"same-audio", b"other-audio"]
+
+
+def test_merge_tags_keeps_existing_first_and_caps():
+    assert _merge_tags(["work", "q3"], ["q3", "budget"]) == ["work", "q3", "budget"]
+    assert _merge_tags(None, ["a", "a"]) == ["a"]
+    assert _merge_tags([f"t{i}" for i in range(9)], ["new1", "new2"]) == [f"t{i}" for i in range(9)] + ["new1"]
+
+
+def test_storage_service_uses_lifespan_http_client(test_db, monkeypatch):
+    monkeypatch.setattr(app_main.settings, "debug", False)
+
+    with TestClient(app):
+        storage_http = app.state.storage_http
+        service = get_storage_service(SimpleNamespace(app=app))
+        assert service.http is storage_http
+        assert not storage_http.is_closed
+
+    assert storage_http.is_closed